@@ -0,0 +1,94 @@
+"""Small SQLite key-value cache shared by the API clients.
+
+Each cache is one table of text values in a SQLite file, stamped with the
+time they were stored. Callers pass the file path from their own module
+constant, where None disables caching. Cache failures are logged and treated
+as misses, so a broken or locked cache file never fails a pipeline run.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _connect(path: str, table: str) -> sqlite3.Connection:
+    """Open the cache file and create the table if it does not exist yet.
+
+    sqlite3.connect creates an empty file before any table exists, so the
+    table is created on every open rather than only by writers; otherwise a
+    reader racing the first write would fail with "no such table".
+    """
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, cached_at REAL NOT NULL)'
+            )
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+def cache_get(
+    path: Optional[str],
+    table: str,
+    key: str,
+    max_age: Optional[float] = None
+) -> Optional[str]:
+    """Return the cached value for key.
+
+    Args:
+        path: SQLite file path, or None if caching is disabled.
+        table: Table holding this cache's entries.
+        key: Cache key.
+        max_age: Seconds an entry stays valid, or None for no expiry.
+
+    Returns:
+        The cached value, or None on a miss, an expired entry, a disabled
+        cache, or a read error.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    oldest = time.time() - max_age if max_age is not None else float('-inf')
+    try:
+        with closing(_connect(path, table)) as conn:
+            row = conn.execute(
+                f'SELECT value FROM {table} WHERE key = ? AND cached_at > ?',
+                (key, oldest)
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning(f"Cache read from {path} failed: {e}")
+        return None
+    return row[0] if row else None
+
+
+def cache_set(path: Optional[str], table: str, key: str, value: str) -> None:
+    """Store value under key; failures are logged, never raised.
+
+    Args:
+        path: SQLite file path, or None if caching is disabled.
+        table: Table holding this cache's entries.
+        key: Cache key.
+        value: Text value to store.
+    """
+    if not path:
+        return
+    try:
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        with closing(_connect(path, table)) as conn, conn:
+            conn.execute(
+                f'INSERT OR REPLACE INTO {table} (key, value, cached_at) '
+                'VALUES (?, ?, ?)',
+                (key, value, time.time())
+            )
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Cache write to {path} failed: {e}")
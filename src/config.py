@@ -14,7 +14,17 @@ YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
 
 # OpenAI API
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+# Summarize via the Responses API instead of Chat Completions
+OPENAI_USE_RESPONSES_API = (
+    os.getenv('OPENAI_USE_RESPONSES_API', 'false').lower() in ('1', 'true', 'yes')
+)
 OPENAI_TTS_VOICE = os.getenv('OPENAI_TTS_VOICE', 'alloy')
+# Retries for rate-limit, connection and 5xx errors (backoff handled by the SDK)
+OPENAI_MAX_RETRIES = int(os.getenv('OPENAI_MAX_RETRIES', 5))
+# Client-side throttling for summarization; set to your account's limits
+OPENAI_RPM_LIMIT = int(os.getenv('OPENAI_RPM_LIMIT', 500))
+OPENAI_TPM_LIMIT = int(os.getenv('OPENAI_TPM_LIMIT', 90000))
 
 # Email configuration
 SMTP_SERVER = os.getenv('SMTP_SERVER')
@@ -117,20 +117,25 @@ def run_pipeline(dry_run: bool = False, hours: int = 24, max_duration_minutes: i
         logger.info(f"Checking for videos from last {hours} hours...")
         all_videos = []
 
-        for subscription in subscriptions:
-            channel_id = subscription['channel_id']
-            channel_name = subscription['channel_name']
+        # One bulk scan: uploads playlists are resolved in batches and the
+        # channels scanned concurrently; a failed channel maps to []
+        try:
+            recent_videos = youtube_api.get_recent_videos_bulk(
+                [subscription['channel_id'] for subscription in subscriptions],
+                hours=hours
+            )
+        except Exception as e:
+            logger.error(f"Error fetching recent videos: {e}")
+            recent_videos = {}
 
-            try:
-                videos = youtube_api.get_recent_videos(channel_id, hours=hours)
-                if videos:
-                    logger.info(
-                        f"Found {len(videos)} new video(s) from {channel_name}"
-                    )
-                    all_videos.extend(videos)
-                stats['total_videos_found'] += len(videos)
-            except Exception as e:
-                logger.error(f"Error fetching videos from {channel_name}: {e}")
+        for subscription in subscriptions:
+            videos = recent_videos.get(subscription['channel_id'], [])
+            if videos:
+                logger.info(
+                    f"Found {len(videos)} new video(s) from {subscription['channel_name']}"
+                )
+                all_videos.extend(videos)
+            stats['total_videos_found'] += len(videos)
 
         logger.info(f"Total videos found: {len(all_videos)}")
 
@@ -0,0 +1,93 @@
+"""Client-side rate limiting for API calls.
+
+This module provides a thread-safe limiter that keeps request and token usage
+under per-minute budgets, so concurrent callers wait locally instead of
+sending requests that the API would reject with HTTP 429.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token-bucket limiter for requests per minute and tokens per minute.
+
+    Both buckets start full and refill continuously. A call to acquire()
+    blocks until one request and the requested number of tokens are
+    available, then deducts them.
+
+    Attributes:
+        requests_per_minute: Request budget per minute.
+        tokens_per_minute: Token budget per minute.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize the limiter with full buckets.
+
+        Args:
+            requests_per_minute: Maximum requests per minute.
+            tokens_per_minute: Maximum tokens per minute.
+            clock: Monotonic time source in seconds (injectable for tests).
+            sleep: Function used to wait (injectable for tests).
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        """Add the capacity accrued since the last update. Caller holds the lock."""
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(
+            self.requests_per_minute,
+            self._requests + elapsed * self.requests_per_minute / 60
+        )
+        self._tokens = min(
+            self.tokens_per_minute,
+            self._tokens + elapsed * self.tokens_per_minute / 60
+        )
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until one request and ``tokens`` tokens fit in the budget.
+
+        Requests larger than the whole token budget are capped at it, so they
+        wait for a full bucket instead of forever.
+
+        Args:
+            tokens: Estimated tokens the request will consume.
+
+        Returns:
+            Total seconds spent waiting.
+        """
+        tokens = min(tokens, self.tokens_per_minute)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return waited
+                wait_time = max(
+                    (1 - self._requests) * 60 / self.requests_per_minute,
+                    (tokens - self._tokens) * 60 / self.tokens_per_minute,
+                )
+            logger.debug(f"Rate limit reached, waiting {wait_time:.2f} seconds")
+            self._sleep(wait_time)
+            waited += wait_time
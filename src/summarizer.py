@@ -1,24 +1,41 @@
 """AI Summarization and Audio Narration module.
 
 This module provides functions to generate concise restatements of YouTube video
-transcripts using OpenAI GPT-4 and convert them to audio using OpenAI TTS.
+transcripts using the configured OpenAI chat model (OPENAI_MODEL, gpt-4o-mini by
+default) and convert them to audio using OpenAI TTS.
 The summarization approach focuses on restating the transcript content in a more
 condensed form while preserving all key points and the speaker's perspective.
 
-Cost Estimation:
+Cost Estimation (per-model rates in _PRICING):
+- gpt-4o-mini: ~$0.00015/1K input tokens, ~$0.0006/1K output tokens
 - GPT-4 Turbo: ~$0.01/1K input tokens, ~$0.03/1K output tokens
 - TTS: ~$15 per 1M characters (standard)
 
 Average cost per video: ~$0.06-0.10 for summary + audio
 """
 
+import hashlib
 import logging
 import os
-from typing import Optional
-
-from openai import OpenAI
-
-from src.config import OPENAI_API_KEY, OPENAI_TTS_VOICE
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+
+from src.cache import cache_get, cache_set
+from src.config import (
+    OPENAI_API_KEY,
+    OPENAI_MAX_RETRIES,
+    OPENAI_MODEL,
+    OPENAI_RPM_LIMIT,
+    OPENAI_TPM_LIMIT,
+    OPENAI_TTS_VOICE,
+    OPENAI_USE_RESPONSES_API,
+)
+from src.rate_limiter import RateLimiter
+
+# openai and tiktoken are imported on first use; together they account for
+# most of this module's import time, which every CLI run and test pays
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -26,10 +43,53 @@ logger = logging.getLogger(__name__)
 # Lazily initialized OpenAI client
 _client = None
 
-
-def get_openai_client() -> OpenAI:
+# Shared across threads so concurrent chunk summaries stay within the limits
+_chat_rate_limiter = RateLimiter(OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT)
+
+# Model settings; part of the cache key, so changing them invalidates entries
+SUMMARY_MODEL = OPENAI_MODEL
+SUMMARY_TEMPERATURE = 0.7
+# A 3-5 sentence restatement runs ~100-200 tokens; the cap leaves headroom
+# without reserving more than needed against the tokens-per-minute limit
+SUMMARY_MAX_TOKENS = 300
+TTS_MODEL = "tts-1"
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You are an expert at restating video content "
+    "concisely while preserving all key points."
+)
+# Routes requests sharing the prompt prefix to the same OpenAI prompt cache
+SUMMARY_PROMPT_CACHE_KEY = "yt_sum_v1"
+
+# USD per 1K (input, output) tokens, for the cost estimate in the logs
+_PRICING = {
+    'gpt-4o-mini': (0.00015, 0.0006),
+    'gpt-4o': (0.0025, 0.01),
+    'gpt-4-turbo': (0.01, 0.03),
+    'gpt-4-turbo-preview': (0.01, 0.03),
+}
+# Models missing from the table are estimated at GPT-4 Turbo rates, an upper bound
+_DEFAULT_PRICING = _PRICING['gpt-4-turbo']
+
+# SQLite file caching API results across runs; None disables caching.
+# Values are stored as TEXT (the summary, or the audio path), so reads and
+# writes involve no JSON or pickle encoding.
+SUMMARY_CACHE_PATH = 'data/cache/summaries.db'
+SUMMARY_CACHE_TABLE = 'openai_results'
+
+# Lazily loaded tiktoken encoding for SUMMARY_MODEL; False once loading failed
+_encoding = None
+
+
+def get_openai_client() -> 'OpenAI':
     """Get or create the OpenAI client instance.
 
+    The client is created once per process, so every summary and TTS call
+    reuses its HTTP connection pool instead of opening new connections.
+    It retries rate-limit (429), connection, and server errors up to
+    OPENAI_MAX_RETRIES times with jittered exponential backoff, honoring any
+    Retry-After header.
+
     Returns:
         OpenAI client instance.
 
@@ -40,10 +100,42 @@ def get_openai_client() -> OpenAI:
     if _client is None:
         if not OPENAI_API_KEY:
             raise ValueError("OpenAI API key is required")
-        _client = OpenAI(api_key=OPENAI_API_KEY)
+        from openai import OpenAI
+
+        _client = OpenAI(api_key=OPENAI_API_KEY, max_retries=OPENAI_MAX_RETRIES)
     return _client
 
 
+def _cache_key(*parts: str) -> str:
+    """Build a content-addressed cache key from the inputs of an API call."""
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[str]:
+    """Return the cached value for key, or None on a miss or disabled cache."""
+    return cache_get(SUMMARY_CACHE_PATH, SUMMARY_CACHE_TABLE, key)
+
+
+def _cache_set(key: str, value: str) -> None:
+    """Store value under key; cache failures are logged, never raised."""
+    cache_set(SUMMARY_CACHE_PATH, SUMMARY_CACHE_TABLE, key, value)
+
+
+def _estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimate the USD cost of a completion from its token usage.
+
+    Args:
+        model: Model name, looked up in _PRICING.
+        input_tokens: Prompt tokens billed.
+        output_tokens: Completion tokens billed.
+
+    Returns:
+        Estimated cost in US dollars.
+    """
+    input_rate, output_rate = _PRICING.get(model, _DEFAULT_PRICING)
+    return (input_tokens * input_rate + output_tokens * output_rate) / 1000
+
+
 def summarize_transcript(
     transcript: str,
     video_title: str,
@@ -51,9 +143,11 @@ def summarize_transcript(
 ) -> str:
     """Generate a concise restatement of a YouTube video transcript.
 
-    Uses OpenAI GPT-4 to create a 3-5 sentence restatement of
+    Uses the configured OpenAI chat model (SUMMARY_MODEL, from
+    OPENAI_MODEL) to create a 3-5 sentence restatement of
     the transcript content in a more concise form while preserving
-    all key points and the speaker's perspective.
+    all key points and the speaker's perspective. Results are cached
+    on disk, so repeat calls with the same inputs skip the API.
 
     Args:
         transcript: Full transcript text of the video.
@@ -83,36 +177,56 @@ Please restate everything discussed in this transcript in a more concise form:
 
 Restatement:"""
 
+    cache_key = _cache_key(
+        'summary', SUMMARY_MODEL, str(SUMMARY_TEMPERATURE),
+        str(SUMMARY_MAX_TOKENS), prompt
+    )
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        logger.info(f"Summarization: cache hit for '{video_title}'")
+        return cached
+
     try:
-        client : OpenAI = get_openai_client()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert at restating video content "
-                               "concisely while preserving all key points."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=500
-        )
-
-        summary = response.choices[0].message.content.strip()
+        client = get_openai_client()
+        # Reserve the prompt plus the largest possible completion
+        _chat_rate_limiter.acquire(int(_count_tokens(prompt)) + SUMMARY_MAX_TOKENS)
+        if OPENAI_USE_RESPONSES_API:
+            response = client.responses.create(
+                model=SUMMARY_MODEL,
+                instructions=SUMMARY_SYSTEM_PROMPT,
+                input=prompt,
+                temperature=SUMMARY_TEMPERATURE,
+                max_output_tokens=SUMMARY_MAX_TOKENS,
+                prompt_cache_key=SUMMARY_PROMPT_CACHE_KEY,
+                store=False
+            )
+            summary = response.output_text.strip()
+            input_tokens = response.usage.input_tokens
+            output_tokens = response.usage.output_tokens
+        else:
+            response = client.chat.completions.create(
+                model=SUMMARY_MODEL,
+                messages=[
+                    {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=SUMMARY_TEMPERATURE,
+                max_tokens=SUMMARY_MAX_TOKENS
+            )
+            summary = response.choices[0].message.content.strip()
+            input_tokens = response.usage.prompt_tokens
+            output_tokens = response.usage.completion_tokens
 
         # Log token usage for cost tracking
-        tokens_used = response.usage.total_tokens
-        input_tokens = response.usage.prompt_tokens
-        output_tokens = response.usage.completion_tokens
-        # GPT-4 Turbo pricing: $0.01/1K input, $0.03/1K output
-        estimated_cost = (input_tokens / 1000) * 0.01 + (output_tokens / 1000) * 0.03
-        logger.info(
-            f"Summarization: {tokens_used} tokens "
-            f"(input: {input_tokens}, output: {output_tokens}), "
-            f"~${estimated_cost:.4f}"
-        )
-
+        if logger.isEnabledFor(logging.INFO):
+            estimated_cost = _estimate_cost(SUMMARY_MODEL, input_tokens, output_tokens)
+            logger.info(
+                f"Summarization: {response.usage.total_tokens} tokens "
+                f"(input: {input_tokens}, output: {output_tokens}), "
+                f"~${estimated_cost:.6f}"
+            )
+
+        _cache_set(cache_key, summary)
         return summary
 
     except Exception as e:
@@ -127,7 +241,9 @@ def generate_audio_narration(
 ) -> str:
     """Generate audio narration of the summary using OpenAI TTS.
 
-    Converts text summary to speech and saves as MP3 file.
+    Converts text summary to speech and saves as MP3 file. If the file at
+    this path was last narrated from the same text (and model and voice)
+    and is still there, it is reused instead of calling the API again.
 
     Args:
         summary_text: Text to convert to speech.
@@ -146,16 +262,25 @@ def generate_audio_narration(
     # Create output filename
     output_path = os.path.join(output_dir, f"{video_id}_summary.mp3")
 
+    # Every text for a video narrates to the same path, so the entry is keyed
+    # by path and records which model, voice and text the file now holds
+    cache_key = _cache_key('tts', output_path)
+    narrated = _cache_key(TTS_MODEL, OPENAI_TTS_VOICE, summary_text)
+    if _cache_get(cache_key) == narrated and os.path.exists(output_path):
+        logger.info(f"TTS: cache hit, reusing {output_path}")
+        return output_path
+
     try:
         client = get_openai_client()
-        response = client.audio.speech.create(
-            model="tts-1",
+        with client.audio.speech.with_streaming_response.create(
+            model=TTS_MODEL,
             voice=OPENAI_TTS_VOICE,
             input=summary_text
-        )
-
-        # Save audio to file
-        response.stream_to_file(output_path)
+        ) as response:
+            # Write audio chunks as they arrive instead of buffering the whole file
+            with open(output_path, 'wb') as f:
+                for chunk in response.iter_bytes(chunk_size=4096):
+                    f.write(chunk)
 
         # Log cost estimate
         # TTS pricing: $15 per 1M characters (standard)
@@ -164,6 +289,7 @@ def generate_audio_narration(
         logger.info(f"TTS: {char_count} characters, ~${estimated_cost:.6f}")
 
         logger.info(f"Audio narration saved to {output_path}")
+        _cache_set(cache_key, narrated)
         return output_path
 
     except Exception as e:
@@ -171,6 +297,41 @@ def generate_audio_narration(
         raise
 
 
+def generate_audio_narrations(
+    items: list[tuple[str, str]],
+    output_dir: str = 'data/audio',
+    max_concurrent: int = 8
+) -> list[str]:
+    """Generate audio narrations for several summaries, a few at a time.
+
+    Each (summary_text, video_id) pair goes through generate_audio_narration,
+    so unchanged narrations are still served from the TTS cache. At most
+    max_concurrent speech requests are in flight, which keeps a large batch
+    from bursting past the TTS rate limit.
+
+    Args:
+        items: (summary_text, video_id) pairs to narrate.
+        output_dir: Directory to save audio files (default: 'data/audio').
+        max_concurrent: Maximum TTS requests in flight at once (default: 8).
+
+    Returns:
+        Paths to the generated audio files, in the order of items.
+
+    Raises:
+        Exception: The error of the first item (in input order) whose
+            narration failed; the other narrations still run to completion.
+    """
+    if not items:
+        return []
+
+    def narrate(item: tuple[str, str]) -> str:
+        summary_text, video_id = item
+        return generate_audio_narration(summary_text, video_id, output_dir)
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrent, len(items))) as executor:
+        return list(executor.map(narrate, items))
+
+
 def create_summary_with_audio(
     transcript: str,
     video_title: str,
@@ -199,7 +360,9 @@ def create_summary_with_audio(
     # Generate text summary
     summary = summarize_transcript(transcript, video_title, video_url)
 
-    # Generate audio narration
+    # Generate audio narration. This needs the finished summary; narrating
+    # sentences while the summary streams would mean splicing separately
+    # synthesized MP3s into one attachment, with seams and a wrong duration.
     audio_path = generate_audio_narration(summary, video_id, output_dir)
 
     return {
@@ -208,11 +371,41 @@ def create_summary_with_audio(
     }
 
 
+def _count_tokens(text: str) -> float:
+    """Count tokens in text using the summary model's tokenizer.
+
+    Uses tiktoken when it is installed and its encoding can be loaded (it is
+    downloaded on first use). Otherwise estimates 1 token per 4 characters.
+
+    Args:
+        text: Text to measure.
+
+    Returns:
+        Token count, or the character-based estimate.
+    """
+    global _encoding
+    if _encoding is None:
+        _encoding = False
+        try:
+            import tiktoken
+            _encoding = tiktoken.encoding_for_model(SUMMARY_MODEL)
+        except ImportError:  # tiktoken is optional
+            pass
+        except Exception as e:
+            logger.warning(f"tiktoken unavailable, estimating token counts: {e}")
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    # Rough estimate: 1 token ≈ 4 characters
+    return len(text) / 4
+
+
 def chunk_transcript(transcript: str, max_tokens: int = 100000) -> list[str]:
     """Split very long transcripts into chunks if needed.
 
-    GPT-4 has a 128k token context window, but we use a conservative
-    default to leave room for the prompt and response.
+    gpt-4o-mini and the other models in _PRICING have a 128k token context
+    window, but we use a conservative default to leave room for the prompt
+    and response. Tokens are counted
+    with tiktoken when available (see _count_tokens).
 
     Args:
         transcript: Full transcript text.
@@ -221,10 +414,7 @@ def chunk_transcript(transcript: str, max_tokens: int = 100000) -> list[str]:
     Returns:
         List of transcript chunks.
     """
-    # Rough estimate: 1 token ≈ 4 characters
-    max_chars = max_tokens * 4
-
-    if len(transcript) <= max_chars:
+    if _count_tokens(transcript) <= max_tokens:
         return [transcript]
 
     # Split into sentences and group into chunks
@@ -232,16 +422,16 @@ def chunk_transcript(transcript: str, max_tokens: int = 100000) -> list[str]:
     chunks = []
     current_chunk = []
     current_length = 0
-    separator_length = 2  # Length of '. '
+    separator_length = _count_tokens('. ')
 
     for sentence in sentences:
-        sentence_length = len(sentence)
-        # Account for separator when calculating if we'd exceed max_chars
+        sentence_length = _count_tokens(sentence)
+        # Account for separator when calculating if we'd exceed max_tokens
         additional_length = sentence_length
         if current_chunk:
             additional_length += separator_length
 
-        if current_length + additional_length > max_chars and current_chunk:
+        if current_length + additional_length > max_tokens and current_chunk:
             # Join sentences and only add period if chunk doesn't already end with one
             chunk_text = '. '.join(current_chunk)
             if not chunk_text.endswith('.'):
@@ -266,19 +456,21 @@ def chunk_transcript(transcript: str, max_tokens: int = 100000) -> list[str]:
 def summarize_long_transcript(
     transcript: str,
     video_title: str,
-    video_url: Optional[str] = None
+    video_url: Optional[str] = None,
+    max_concurrent: int = 5
 ) -> str:
     """Summarize very long transcripts by chunking and then combining summaries.
 
     For transcripts that exceed the token limit, this function:
     1. Splits the transcript into manageable chunks
-    2. Summarizes each chunk separately
+    2. Summarizes the chunks concurrently, keeping their original order
     3. Combines the chunk summaries and creates a final summary
 
     Args:
         transcript: Full transcript text.
         video_title: Title of the video.
         video_url: Optional YouTube URL.
+        max_concurrent: Maximum chunk summaries in flight at once (default: 5).
 
     Returns:
         Final 3-5 sentence summary of the entire video.
@@ -291,12 +483,15 @@ def summarize_long_transcript(
     if len(chunks) == 1:
         return summarize_transcript(transcript, video_title, video_url)
 
-    # Summarize each chunk
-    chunk_summaries = []
-    for i, chunk in enumerate(chunks):
-        logger.info(f"Summarizing chunk {i + 1}/{len(chunks)}")
-        summary = summarize_transcript(chunk, f"{video_title} (Part {i + 1})")
-        chunk_summaries.append(summary)
+    def summarize_chunk(index: int, chunk: str) -> str:
+        logger.info(f"Summarizing chunk {index + 1}/{len(chunks)}")
+        return summarize_transcript(chunk, f"{video_title} (Part {index + 1})")
+
+    # Each chunk already fills the per-request token budget, so chunks can't be
+    # batched into one prompt; summarize them in parallel instead. map() yields
+    # results in chunk order.
+    with ThreadPoolExecutor(max_workers=min(max_concurrent, len(chunks))) as executor:
+        chunk_summaries = list(executor.map(summarize_chunk, range(len(chunks)), chunks))
 
     # Combine and re-summarize
     combined = '\n\n'.join(chunk_summaries)
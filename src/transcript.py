@@ -9,6 +9,8 @@ library fetches transcripts independently and is free to call as many times as n
 
 import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import (
@@ -17,15 +19,57 @@ from youtube_transcript_api._errors import (
     VideoUnavailable,
 )
 
+try:
+    import re2
+except ImportError:  # google-re2 is optional
+    re2 = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Lazily created transcript API clients, one per thread; each is reused so
+# its HTTP session keeps connections to YouTube open across videos. Kept per
+# thread, like youtube_client's services, because a requests.Session (and its
+# cookie jar, which holds YouTube's consent cookie) is not thread-safe.
+_api = threading.local()
+
+# Bracketed caption annotations like [Music] or [Applause]. Transcripts are
+# joined into one line, so a lazy '\[.*?\]' would rescan to the end of the
+# text from every unclosed '[' (quadratic in stdlib re). Excluding brackets
+# from the body stops each failed attempt at the next '[' or ']', which keeps
+# stdlib re linear too; RE2 is used when google-re2 is installed.
+_ANNOTATION_PATTERN = r'\[[^\[\]]*\]'
+_ANNOTATION_RE = (re2 or re).compile(_ANNOTATION_PATTERN)
+
+# Whitespace the cleanup would change: runs, leading/trailing, or anything
+# other than a plain space (tabs, newlines, non-breaking spaces)
+_UNCLEAN_WHITESPACE_RE = re.compile(r'\s\s|^\s|\s$|[^\S ]')
+
+
+def get_transcript_api() -> YouTubeTranscriptApi:
+    """Get or create this thread's YouTubeTranscriptApi instance.
+
+    The instance owns a requests session, so creating it once per thread lets
+    every transcript lookup on that thread reuse the session's pooled
+    connections instead of repeating the TCP and TLS handshake per video.
+
+    Returns:
+        YouTubeTranscriptApi instance.
+    """
+    api = getattr(_api, 'instance', None)
+    if api is None:
+        api = _api.instance = YouTubeTranscriptApi()
+    return api
+
 
 def clean_transcript_text(text: str) -> str:
     """Clean up transcript text for AI summarization.
 
     Removes common artifacts from auto-generated captions such as
-    [Music], [Applause], and other bracketed annotations.
+    [Music], [Applause], and other bracketed annotations. Both passes are
+    linear in the length of the text, with or without google-re2, so each
+    video is cleaned once, inside get_transcript as its transcript arrives
+    (on get_transcripts' worker threads when fetching a batch).
 
     Args:
         text: Raw transcript text.
@@ -33,16 +77,16 @@ def clean_transcript_text(text: str) -> str:
     Returns:
         Cleaned transcript text with artifacts removed.
     """
-    # Remove all bracketed annotations like [Music], [Applause], etc.
-    text = re.sub(r'\[.*?\]', '', text)
-
-    # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
+    # Already-clean text (no '[' and tidy spacing) is returned as-is
+    if '[' not in text and not _UNCLEAN_WHITESPACE_RE.search(text):
+        return text
 
-    # Fix common spacing issues
-    text = text.strip()
+    # Remove all bracketed annotations like [Music], [Applause], etc.
+    text = _ANNOTATION_RE.sub('', text)
 
-    return text
+    # Collapse whitespace runs and trim the ends; str.split() treats the
+    # same characters as whitespace as re's \s, without a second regex pass
+    return ' '.join(text.split())
 
 
 def get_transcript(video_id: str, languages: list[str] | None = None) -> str | None:
@@ -63,7 +107,7 @@ def get_transcript(video_id: str, languages: list[str] | None = None) -> str | N
 
     try:
         # Fetch transcript list
-        api = YouTubeTranscriptApi()
+        api = get_transcript_api()
         transcript_list = api.list(video_id)
 
         # Try to find transcript in preferred languages
@@ -87,7 +131,9 @@ def get_transcript(video_id: str, languages: list[str] | None = None) -> str | N
                 logger.warning(f"No transcript found for video {video_id}")
                 return None
 
-        # Fetch and format transcript
+        # Fetch and format transcript. An hour of captions is only a few
+        # thousand snippets; str.join sizes its result in one pass over the
+        # list, so a columnar copy of the texts would just add a conversion.
         transcript_data = transcript.fetch()
         full_text = ' '.join([entry.text for entry in transcript_data])
 
@@ -107,6 +153,36 @@ def get_transcript(video_id: str, languages: list[str] | None = None) -> str | N
         return None
 
 
+def get_transcripts(
+    video_ids: list[str],
+    languages: list[str] | None = None,
+    max_concurrent: int = 10
+) -> dict[str, str | None]:
+    """Retrieve transcripts for a batch of videos, several at a time.
+
+    get_transcript handles its own errors, so every ID maps to a transcript
+    or None and one bad video never fails the batch. Each worker thread
+    gets its own YouTubeTranscriptApi from get_transcript_api.
+
+    Args:
+        video_ids: YouTube video IDs.
+        languages: List of preferred language codes (default: ['en']).
+        max_concurrent: Maximum transcript fetches in flight at once (default: 10).
+
+    Returns:
+        Dictionary mapping each video ID to its transcript, or None if
+        unavailable, in the order of video_ids.
+    """
+    if not video_ids:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrent, len(video_ids))) as executor:
+        transcripts = executor.map(
+            lambda video_id: get_transcript(video_id, languages), video_ids
+        )
+        return dict(zip(video_ids, transcripts))
+
+
 def get_available_languages(video_id: str) -> list[dict]:
     """Get list of available transcript languages for a video.
 
@@ -121,7 +197,7 @@ def get_available_languages(video_id: str) -> list[dict]:
         Returns empty list if no transcripts are available.
     """
     try:
-        api = YouTubeTranscriptApi()
+        api = get_transcript_api()
         transcript_list = api.list(video_id)
         languages = []
 
@@ -10,27 +10,153 @@ Quota Usage Notes:
 - Using search API: 100 units per call (avoided in favor of playlist approach)
 
 Daily quota limit: 10,000 units
+
+Requests pass a `fields` filter naming only the keys this module reads.
+Quota cost is unchanged, but a full playlistItems page carries every
+thumbnail size and localization; filtered, it is a fraction of the bytes
+to download and decode.
 """
 
 import logging
+import random
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Iterator, Optional
 
+# googleapiclient stays a top-level import, unlike openai in summarizer:
+# every pipeline run builds a service anyway, youtube_oauth imports it too,
+# and HttpError/JsonModel are needed at class definition and in except clauses
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; responses fall back to stdlib json
+    orjson = None
 
+from src.cache import cache_get, cache_set
 from src.config import YOUTUBE_API_KEY
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# SQLite file caching channel -> uploads playlist IDs across runs; None
+# disables caching. The mapping is stable, so entries live for a week. A hit
+# sends no request at all, which beats revalidating with an ETag: a 304 still
+# costs a round trip, and googleapiclient raises it as an HttpError.
+PLAYLIST_CACHE_PATH = 'data/cache/youtube.db'
+PLAYLIST_CACHE_TABLE = 'uploads_playlist_ids'
+PLAYLIST_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# Retry backoff: BASE * 2**attempt seconds, capped at MAX, plus up to JITTER
+# seconds so parallel channel scans that hit a 429 together don't retry in step
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+RETRY_JITTER = 0.5
+
+# Statuses worth retrying: 403 (quota/rate limit exceeded), 429, and
+# transient server errors
+RETRYABLE_STATUSES = frozenset({403, 429, 500, 502, 503, 504})
+
+# Most IDs channels.list accepts in one request
+CHANNELS_BATCH_SIZE = 50
+
+# Partial-response filters for each request (see the module docstring)
+SUBSCRIPTIONS_FIELDS = 'items/snippet(resourceId/channelId,title),nextPageToken'
+CHANNELS_FIELDS = 'items(id,contentDetails/relatedPlaylists/uploads)'
+PLAYLIST_ITEMS_FIELDS = (
+    'items(snippet(publishedAt,title,channelTitle,description,'
+    'thumbnails/default/url),contentDetails/videoId),nextPageToken'
+)
+VIDEOS_FIELDS = 'items/contentDetails/duration'
+
+
+def _cached_playlist_id(channel_id: str) -> Optional[str]:
+    """Return the cached uploads playlist ID, or None on a miss or expiry."""
+    return cache_get(
+        PLAYLIST_CACHE_PATH, PLAYLIST_CACHE_TABLE, channel_id,
+        max_age=PLAYLIST_CACHE_TTL_SECONDS
+    )
+
+
+def _cache_playlist_id(channel_id: str, playlist_id: str) -> None:
+    """Store a channel's uploads playlist ID; failures are logged, never raised."""
+    cache_set(PLAYLIST_CACHE_PATH, PLAYLIST_CACHE_TABLE, channel_id, playlist_id)
+
+
+# Built services per thread, keyed by API key. Building parses the v3
+# discovery document, so clients with the same key share one service; it
+# stays per thread because the underlying httplib2.Http is not thread-safe.
+# That Http keeps its connection to www.googleapis.com alive, so each
+# thread pays for one TCP+TLS handshake, not one per request; an httpx
+# HTTP/2 transport would mainly add a dependency and an adapter to maintain.
+_services = threading.local()
+
+
+def _get_service(api_key: str):
+    """Return this thread's YouTube service for api_key, building it once."""
+    services = getattr(_services, 'by_key', None)
+    if services is None:
+        services = _services.by_key = {}
+    if api_key not in services:
+        # Decode playlist pages and other responses with orjson if installed
+        model_kwargs = {'model': _OrjsonModel()} if orjson is not None else {}
+        services[api_key] = build(
+            'youtube', 'v3',
+            developerKey=api_key,
+            static_discovery=True,
+            cache_discovery=False,
+            **model_kwargs
+        )
+    return services[api_key]
+
+
+class _OrjsonModel(JsonModel):
+    """JsonModel that decodes response bodies with orjson instead of json."""
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Like JsonModel, hand back non-JSON bodies (e.g. a proxy's HTML
+            # error page) as text instead of raising
+            if isinstance(content, bytes):
+                content = content.decode('utf-8', errors='replace')
+            return content
+        if self._data_wrapper and 'data' in body:
+            body = body['data']
+        return body
+
 
 class QuotaTracker:
-    """Tracks YouTube API quota usage."""
+    """Tracks YouTube API quota usage. Safe to share between threads.
+    
+    Operation names and unit counts are kept in two parallel sequences
+    rather than a dict per call; the operations property rebuilds the
+    per-call records on demand.
+    
+    Attributes:
+        total_units: Running total of quota units used.
+    """
     
     def __init__(self):
         self.total_units = 0
-        self.operations = []
+        self._operation_names: list[str] = []
+        self._operation_units = array('i')
+        self._lock = threading.Lock()
+    
+    @property
+    def operations(self) -> list[dict]:
+        """Logged operations as dicts with 'operation' and 'units' keys."""
+        with self._lock:
+            return [
+                {'operation': operation, 'units': units}
+                for operation, units in zip(self._operation_names, self._operation_units)
+            ]
     
     def log_usage(self, operation: str, units: int):
         """Log quota usage for an API operation.
@@ -39,9 +165,12 @@ class QuotaTracker:
             operation: Description of the API operation.
             units: Number of quota units consumed.
         """
-        self.total_units += units
-        self.operations.append({'operation': operation, 'units': units})
-        logger.info(f"YouTube API: {operation} used {units} quota units (total: {self.total_units})")
+        with self._lock:
+            self.total_units += units
+            self._operation_names.append(operation)
+            self._operation_units.append(units)
+            total = self.total_units
+        logger.info(f"YouTube API: {operation} used {units} quota units (total: {total})")
     
     def get_total_usage(self) -> int:
         """Return total quota units used."""
@@ -49,8 +178,10 @@ class QuotaTracker:
     
     def reset(self):
         """Reset the quota tracker."""
-        self.total_units = 0
-        self.operations = []
+        with self._lock:
+            self.total_units = 0
+            self._operation_names = []
+            self._operation_units = array('i')
 
 
 class YouTubeClient:
@@ -77,15 +208,36 @@ class YouTubeClient:
         if not self._api_key:
             raise ValueError("YouTube API key is required")
         
-        self._youtube = None
         self.quota_tracker = QuotaTracker()
     
     @property
     def youtube(self):
-        """Lazily initialize and return the YouTube API service object."""
-        if self._youtube is None:
-            self._youtube = build('youtube', 'v3', developerKey=self._api_key)
-        return self._youtube
+        """Lazily initialize and return this thread's YouTube API service object."""
+        return _get_service(self._api_key)
+    
+    @staticmethod
+    def _retry_delay(error: HttpError, attempt: int) -> float:
+        """Seconds to wait before retrying a failed call.
+        
+        Honors a numeric Retry-After header from the server (capped at
+        RETRY_MAX_DELAY); otherwise uses jittered exponential backoff.
+        
+        Args:
+            error: The retryable HttpError.
+            attempt: Zero-based number of the attempt that failed.
+        
+        Returns:
+            Delay in seconds.
+        """
+        # httplib2 responses are dicts of lowercased header names
+        retry_after = error.resp.get('retry-after') if isinstance(error.resp, dict) else None
+        if retry_after:
+            try:
+                return min(RETRY_MAX_DELAY, max(0.0, float(retry_after)))
+            except ValueError:
+                pass  # HTTP-date form; fall back to backoff
+        backoff = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+        return backoff + random.uniform(0, RETRY_JITTER)
     
     def _api_call_with_retry(self, func, max_retries: int = 3):
         """Execute an API call with retry logic for transient failures.
@@ -101,18 +253,20 @@ class YouTubeClient:
             HttpError: If the API call fails after all retries.
             Exception: If max retries are exceeded.
         """
-        import time
-        
         for attempt in range(max_retries):
             try:
                 return func()
             except HttpError as e:
-                if e.resp.status in [403, 429, 500, 503]:
+                if e.resp.status in RETRYABLE_STATUSES:
                     # Quota exceeded, rate limit, or server error - retry with backoff
-                    wait_time = 2 ** attempt
+                    if attempt == max_retries - 1:
+                        # Out of attempts; don't sleep before giving up
+                        logger.error(f"YouTube API error (status {e.resp.status}): {e}")
+                        break
+                    wait_time = self._retry_delay(e, attempt)
                     logger.warning(
                         f"API error (status {e.resp.status}), "
-                        f"retrying in {wait_time} seconds... (attempt {attempt + 1}/{max_retries})"
+                        f"retrying in {wait_time:.1f} seconds... (attempt {attempt + 1}/{max_retries})"
                     )
                     time.sleep(wait_time)
                 else:
@@ -122,53 +276,72 @@ class YouTubeClient:
         
         raise Exception(f"Max retries ({max_retries}) exceeded for API call")
     
-    def get_subscriptions(self) -> list[dict]:
-        """Retrieve all channels the authenticated user is subscribed to.
+    def iter_subscriptions(self) -> Iterator[dict]:
+        """Yield the channels the authenticated user is subscribed to.
+        
+        Pages are fetched as the caller consumes them, so only one page of
+        results is held at a time and callers can start work before the
+        last page arrives.
         
         Note: This method requires OAuth 2.0 authentication with the
         'youtube.readonly' scope, as it uses 'mine=True'. When using
         only an API key, this will fail.
         
-        Returns:
-            List of dictionaries containing channel_id and channel_name
-            for each subscription.
+        Yields:
+            Dictionaries containing channel_id and channel_name for each
+            subscription.
         
         Raises:
             HttpError: If the API call fails.
         """
-        subscriptions = []
-        page_token = None
         page_count = 0
         
-        while True:
-            def make_request():
-                return self.youtube.subscriptions().list(
-                    part='snippet',
-                    mine=True,
-                    maxResults=50,
-                    pageToken=page_token
-                ).execute()
-            
-            response = self._api_call_with_retry(make_request)
+        # Build the resource once; list_next() derives each following page's
+        # request from the previous one and returns None after the last page
+        subscriptions_resource = self.youtube.subscriptions()
+        request = subscriptions_resource.list(
+            part='snippet',
+            mine=True,
+            maxResults=50,
+            fields=SUBSCRIPTIONS_FIELDS
+        )
+        
+        while request is not None:
+            response = self._api_call_with_retry(request.execute)
             page_count += 1
             self.quota_tracker.log_usage(f'subscriptions.list (page {page_count})', 1)
             
             for item in response.get('items', []):
-                subscriptions.append({
-                    'channel_id': item['snippet']['resourceId']['channelId'],
-                    'channel_name': item['snippet']['title']
-                })
+                snippet = item['snippet']
+                yield {
+                    'channel_id': snippet['resourceId']['channelId'],
+                    'channel_name': snippet['title']
+                }
             
-            page_token = response.get('nextPageToken')
-            if not page_token:
-                break
+            request = subscriptions_resource.list_next(request, response)
+    
+    def get_subscriptions(self) -> list[dict]:
+        """Retrieve all channels the authenticated user is subscribed to.
+        
+        See iter_subscriptions for authentication requirements.
+        
+        Returns:
+            List of dictionaries containing channel_id and channel_name
+            for each subscription.
         
+        Raises:
+            HttpError: If the API call fails.
+        """
+        subscriptions = list(self.iter_subscriptions())
         logger.info(f"Retrieved {len(subscriptions)} subscriptions")
         return subscriptions
     
     def get_channel_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
         """Get the uploads playlist ID for a channel.
         
+        IDs are cached on disk, so repeat runs skip the channels.list call
+        (and its quota unit) for channels seen in the last week.
+        
         Args:
             channel_id: The YouTube channel ID.
         
@@ -178,10 +351,15 @@ class YouTubeClient:
         Raises:
             HttpError: If the API call fails.
         """
+        cached = _cached_playlist_id(channel_id)
+        if cached is not None:
+            return cached
+        
         def make_request():
             return self.youtube.channels().list(
                 part='contentDetails',
-                id=channel_id
+                id=channel_id,
+                fields=CHANNELS_FIELDS
             ).execute()
         
         response = self._api_call_with_retry(make_request)
@@ -192,9 +370,67 @@ class YouTubeClient:
             logger.warning(f"No channel found for ID: {channel_id}")
             return None
         
-        return items[0]['contentDetails']['relatedPlaylists']['uploads']
+        playlist_id = items[0]['contentDetails']['relatedPlaylists']['uploads']
+        _cache_playlist_id(channel_id, playlist_id)
+        return playlist_id
     
-    def get_recent_videos(self, channel_id: str, hours: int = 24) -> list[dict]:
+    def get_channel_uploads_playlist_ids(self, channel_ids: list[str]) -> dict[str, str]:
+        """Get the uploads playlist IDs for several channels.
+        
+        Cached IDs are used as-is; the rest are looked up with one
+        channels.list call per CHANNELS_BATCH_SIZE channels instead of one
+        call per channel.
+        
+        Args:
+            channel_ids: The YouTube channel IDs.
+        
+        Returns:
+            Dictionary mapping each found channel ID to its uploads playlist
+            ID. Channels that were not found are left out.
+        
+        Raises:
+            HttpError: If an API call fails.
+        """
+        playlist_ids = {}
+        missing = []
+        for channel_id in dict.fromkeys(channel_ids):
+            cached = _cached_playlist_id(channel_id)
+            if cached is not None:
+                playlist_ids[channel_id] = cached
+            else:
+                missing.append(channel_id)
+        
+        for start in range(0, len(missing), CHANNELS_BATCH_SIZE):
+            batch = missing[start:start + CHANNELS_BATCH_SIZE]
+            
+            def make_request():
+                return self.youtube.channels().list(
+                    part='contentDetails',
+                    id=','.join(batch),
+                    maxResults=CHANNELS_BATCH_SIZE,
+                    fields=CHANNELS_FIELDS
+                ).execute()
+            
+            response = self._api_call_with_retry(make_request)
+            self.quota_tracker.log_usage(f'channels.list ({len(batch)} channels)', 1)
+            
+            for item in response.get('items', []):
+                playlist_id = item['contentDetails']['relatedPlaylists']['uploads']
+                playlist_ids[item['id']] = playlist_id
+                _cache_playlist_id(item['id'], playlist_id)
+        
+        not_found = [c for c in missing if c not in playlist_ids]
+        if not_found:
+            logger.warning(f"No channel found for IDs: {', '.join(not_found)}")
+        
+        return playlist_ids
+    
+    def get_recent_videos(
+        self,
+        channel_id: str,
+        hours: int = 24,
+        uploads_playlist_id: Optional[str] = None
+    ) -> list[dict]:
         """Fetch recent videos from a channel's uploads playlist.
         
         This method uses the uploads playlist approach instead of the search API
@@ -203,6 +439,9 @@ class YouTubeClient:
         Args:
             channel_id: The YouTube channel ID.
             hours: Number of hours to look back for recent videos (default: 24).
+            uploads_playlist_id: The channel's uploads playlist ID, if already
+                known (e.g. from get_channel_uploads_playlist_ids); looked up
+                otherwise.
         
         Returns:
             List of dictionaries containing video details for videos
@@ -212,7 +451,8 @@ class YouTubeClient:
             HttpError: If the API call fails.
         """
         # Get the uploads playlist ID
-        uploads_playlist_id = self.get_channel_uploads_playlist_id(channel_id)
+        if uploads_playlist_id is None:
+            uploads_playlist_id = self.get_channel_uploads_playlist_id(channel_id)
         if not uploads_playlist_id:
             return []
         
@@ -229,7 +469,8 @@ class YouTubeClient:
                     part='snippet,contentDetails',
                     playlistId=uploads_playlist_id,
                     maxResults=50,
-                    pageToken=page_token
+                    pageToken=page_token,
+                    fields=PLAYLIST_ITEMS_FIELDS
                 ).execute()
             
             response = self._api_call_with_retry(make_request)
@@ -242,34 +483,42 @@ class YouTubeClient:
             if not items:
                 break
             
-            # Check if we've gone past the time window
-            all_older = True
+            # Uploads are listed newest first, so the first item older than
+            # the window means every later item (and page) is older too.
+            # Inactive channels thus cost one call and one parsed item; a
+            # cached "last top video ID" would still need this call to compare
+            # against, and would hide in-window videos a failed run missed
+            reached_cutoff = False
             
             for item in items:
                 published_at_str = item['snippet']['publishedAt']
-                # Parse ISO 8601 date format
+                # Parse ISO 8601 date format with the C-implemented parser;
+                # fromisoformat only accepts a trailing 'Z' from Python 3.11
                 published_at = datetime.fromisoformat(
                     published_at_str.replace('Z', '+00:00')
                 )
                 
-                if published_at >= published_after:
-                    all_older = False
-                    videos.append({
-                        'video_id': item['contentDetails']['videoId'],
-                        'title': item['snippet']['title'],
-                        'channel_id': channel_id,
-                        'channel_name': item['snippet'].get('channelTitle', ''),
-                        'published_at': published_at_str,
-                        'description': item['snippet'].get('description', ''),
-                        'thumbnail_url': item['snippet'].get('thumbnails', {}).get(
-                            'default', {}
-                        ).get('url', '')
-                    })
+                if published_at < published_after:
+                    reached_cutoff = True
+                    break
+                
+                # Plain dicts: run_pipeline, Database and EmailSender use
+                # .get() and {**video}, and a run yields few videos
+                videos.append({
+                    'video_id': item['contentDetails']['videoId'],
+                    'title': item['snippet']['title'],
+                    'channel_id': channel_id,
+                    'channel_name': item['snippet'].get('channelTitle', ''),
+                    'published_at': published_at_str,
+                    'description': item['snippet'].get('description', ''),
+                    'thumbnail_url': item['snippet'].get('thumbnails', {}).get(
+                        'default', {}
+                    ).get('url', '')
+                })
             
-            # Stop pagination if all items are older than our window
-            # or if there's no next page
+            # Stop pagination once past the time window or if there's no next page
             page_token = response.get('nextPageToken')
-            if all_older or not page_token:
+            if reached_cutoff or not page_token:
                 break
         
         logger.info(
@@ -293,7 +542,8 @@ class YouTubeClient:
         def make_request():
             return self.youtube.videos().list(
                 part='contentDetails',
-                id=video_id
+                id=video_id,
+                fields=VIDEOS_FIELDS
             ).execute()
 
         response = self._api_call_with_retry(make_request)
@@ -333,14 +583,68 @@ class YouTubeClient:
 
         return hours * 3600 + minutes * 60 + seconds
 
+    def get_recent_videos_bulk(
+        self,
+        channel_ids: list[str],
+        hours: int = 24,
+        max_concurrent: int = 10
+    ) -> dict[str, list[dict]]:
+        """Fetch recent videos from several channels concurrently.
+
+        This is run_pipeline's channel scan. Uploads playlist IDs for all
+        channels come from get_channel_uploads_playlist_ids (cache, then up
+        to 50 channels per channels.list call); each channel's playlistItems
+        pages are then read by get_recent_videos on a thread pool. A channel
+        whose scan raises is logged and skipped rather than failing the rest.
+
+        Args:
+            channel_ids: The YouTube channel IDs.
+            hours: Number of hours to look back for recent videos (default: 24).
+            max_concurrent: Maximum channels scanned at once (default: 10).
+
+        Returns:
+            Dictionary mapping each channel ID, in input order, to its recent
+            videos. Channels that were not found or whose scan failed map to
+            an empty list.
+
+        Raises:
+            HttpError: If resolving the uploads playlists fails.
+        """
+        channel_ids = list(dict.fromkeys(channel_ids))
+        playlist_ids = self.get_channel_uploads_playlist_ids(channel_ids)
+        found = [channel_id for channel_id in channel_ids if channel_id in playlist_ids]
+
+        def fetch_channel(channel_id: str) -> list[dict]:
+            try:
+                return self.get_recent_videos(
+                    channel_id, hours, uploads_playlist_id=playlist_ids[channel_id]
+                )
+            except Exception as e:
+                # Includes retries running out; one channel never sinks the scan
+                logger.error(f"Error fetching videos from channel {channel_id}: {e}")
+                return []
+
+        results = {channel_id: [] for channel_id in channel_ids}
+        if found:
+            workers = min(max_concurrent, len(found))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results.update(zip(found, executor.map(fetch_channel, found)))
+        return results
+
     def get_recent_videos_from_subscriptions(
-        self, hours: int = 24, max_channels: Optional[int] = None
+        self,
+        hours: int = 24,
+        max_channels: Optional[int] = None,
+        max_concurrent: int = 10
     ) -> list[dict]:
         """Fetch recent videos from all subscribed channels.
 
+        Channels are scanned concurrently (see get_recent_videos_bulk).
+
         Args:
             hours: Number of hours to look back for recent videos (default: 24).
             max_channels: Maximum number of channels to check (for quota management).
+            max_concurrent: Maximum channels scanned at once (default: 10).
 
         Returns:
             List of all recent videos from subscribed channels.
@@ -353,16 +657,14 @@ class YouTubeClient:
         if max_channels:
             subscriptions = subscriptions[:max_channels]
 
-        all_videos = []
-        for subscription in subscriptions:
-            try:
-                videos = self.get_recent_videos(subscription['channel_id'], hours)
-                all_videos.extend(videos)
-            except HttpError as e:
-                logger.error(
-                    f"Error fetching videos from {subscription['channel_name']}: {e}"
-                )
-                continue
+        videos_by_channel = self.get_recent_videos_bulk(
+            [subscription['channel_id'] for subscription in subscriptions],
+            hours,
+            max_concurrent
+        )
+        all_videos = [
+            video for videos in videos_by_channel.values() for video in videos
+        ]
 
         # Sort by published date, newest first
         all_videos.sort(key=lambda x: x['published_at'], reverse=True)
@@ -0,0 +1,87 @@
+"""Shared pytest fixtures for the test suite."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _no_real_logging():
+    """Replace src.main.setup_logging with a mock for the whole session.
+
+    main() calls setup_logging on every invocation; patching it once keeps any
+    test from reconfiguring the root logger or opening a log file. Direct tests
+    of setup_logging import the real function before this fixture runs.
+    """
+    with patch('src.main.setup_logging') as mock_setup_logging:
+        yield mock_setup_logging
+
+
+@pytest.fixture
+def mock_setup_logging(_no_real_logging):
+    """The session-wide setup_logging mock, with calls from earlier tests cleared."""
+    _no_real_logging.reset_mock()
+    return _no_real_logging
+
+
+@pytest.fixture(autouse=True)
+def no_summary_cache(monkeypatch):
+    """Disable the summarizer's on-disk API cache.
+
+    Otherwise a result cached by one test (or a real run in data/cache) would
+    short-circuit the mocked OpenAI client in another. Cache tests re-enable it
+    with a path under tmp_path.
+    """
+    monkeypatch.setattr('src.summarizer.SUMMARY_CACHE_PATH', None)
+
+
+@pytest.fixture(autouse=True)
+def no_playlist_cache(monkeypatch):
+    """Disable the YouTube client's on-disk uploads playlist cache.
+
+    Otherwise a playlist ID cached by one test would skip the mocked
+    channels.list call in another. Cache tests re-enable it under tmp_path.
+    """
+    monkeypatch.setattr('src.youtube_client.PLAYLIST_CACHE_PATH', None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_openai_client(monkeypatch):
+    """Drop the summarizer's memoized OpenAI client around each test.
+
+    get_openai_client builds the client once per process; resetting it keeps a
+    client created by one test from leaking into the next.
+    """
+    monkeypatch.setattr('src.summarizer._client', None)
+
+
+@pytest.fixture(autouse=True)
+def no_tiktoken_download(monkeypatch):
+    """Count summarizer tokens with the character estimate instead of tiktoken.
+
+    Loading tiktoken's encoding downloads its BPE file on first use, which
+    would make whichever test runs first depend on the network. Tests of the
+    tokenizer path install a stub encoding instead.
+    """
+    monkeypatch.setattr('src.summarizer._encoding', False)
+
+
+@pytest.fixture(autouse=True)
+def fresh_transcript_api(monkeypatch):
+    """Drop the memoized YouTubeTranscriptApi instances so each test builds its own.
+
+    Tests patch src.transcript.YouTubeTranscriptApi; without the reset, an
+    instance from an earlier test's mock would be reused.
+    """
+    monkeypatch.setattr('src.transcript._api', threading.local())
+
+
+@pytest.fixture(autouse=True)
+def fresh_youtube_services(monkeypatch):
+    """Drop YouTube services built by earlier tests.
+
+    Services are shared across YouTubeClient instances, so without the reset
+    a test patching googleapiclient's build would get an earlier test's mock.
+    """
+    monkeypatch.setattr('src.youtube_client._services', threading.local())
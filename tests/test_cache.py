@@ -0,0 +1,58 @@
+"""Unit tests for the SQLite key-value cache module."""
+
+import logging
+import sqlite3
+
+from src.cache import cache_get, cache_set
+
+
+class TestCache:
+    """Tests for cache_get and cache_set."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a stored value is returned, creating the directory."""
+        path = str(tmp_path / "cache" / "test.db")
+
+        cache_set(path, 'entries', 'key', 'value')
+
+        assert cache_get(path, 'entries', 'key') == 'value'
+        assert cache_get(path, 'entries', 'other') is None
+
+    def test_tables_are_separate(self, tmp_path):
+        """Test that two caches can share one file without seeing each other."""
+        path = str(tmp_path / "test.db")
+
+        cache_set(path, 'first', 'key', 'one')
+        cache_set(path, 'second', 'key', 'two')
+
+        assert cache_get(path, 'first', 'key') == 'one'
+        assert cache_get(path, 'second', 'key') == 'two'
+
+    def test_expired_entry_is_a_miss(self, tmp_path):
+        """Test that entries older than max_age are ignored."""
+        path = str(tmp_path / "test.db")
+        cache_set(path, 'entries', 'key', 'value')
+
+        assert cache_get(path, 'entries', 'key', max_age=3600) == 'value'
+        assert cache_get(path, 'entries', 'key', max_age=-1) is None
+
+    def test_disabled_cache(self, tmp_path):
+        """Test that a None path neither stores nor returns anything."""
+        cache_set(None, 'entries', 'key', 'value')
+
+        assert cache_get(None, 'entries', 'key') is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_read_before_table_exists(self, tmp_path, caplog):
+        """Test that a file created but not yet written reads as a clean miss.
+
+        sqlite3.connect creates the file before any table; a reader racing
+        the first write must not log a "no such table" warning.
+        """
+        path = str(tmp_path / "test.db")
+        sqlite3.connect(path).close()
+
+        with caplog.at_level(logging.WARNING, logger='src.cache'):
+            assert cache_get(path, 'entries', 'key') is None
+
+        assert caplog.records == []
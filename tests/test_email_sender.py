@@ -3,9 +3,69 @@
 These tests use mocks to avoid making real SMTP connections during testing.
 """
 
+import io
 import os
+import re
 import pytest
-from unittest.mock import MagicMock, patch, mock_open
+from unittest.mock import MagicMock, patch
+
+
+FAKE_AUDIO_DATA = b"fake audio data"
+
+# Markup that must never survive escaping, and the entities it should become
+_UNSAFE_RE = re.compile(r"<script|<iframe|javascript:")
+_SAFE_RE = re.compile(r"&lt;script&gt;|&amp;")
+
+
+def _fast_open(path, mode="r", *args, **kwargs):
+    """Stand-in for open() that serves the fake audio bytes from memory."""
+    assert "b" in mode
+    return io.BytesIO(FAKE_AUDIO_DATA)
+
+
+@pytest.fixture
+def with_audio(monkeypatch):
+    """Make the audio attachment path exist and read from an in-memory buffer."""
+    monkeypatch.setattr("os.path.exists", lambda path: True)
+    monkeypatch.setattr("src.email_sender.open", _fast_open, raising=False)
+
+
+@pytest.fixture
+def without_audio(monkeypatch):
+    """Make the audio attachment path look missing."""
+    monkeypatch.setattr("os.path.exists", lambda path: False)
+
+
+@pytest.fixture
+def email_sender():
+    """EmailSender with explicit test SMTP configuration."""
+    from src.email_sender import EmailSender
+
+    return EmailSender(
+        smtp_server="smtp.test.com",
+        smtp_port=587,
+        username="test@test.com",
+        password="testpass",
+        recipient="recipient@test.com",
+    )
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    """Patch smtplib.SMTP and return the server object used inside the with-block."""
+    mock_server = MagicMock()
+    mock_smtp = MagicMock()
+    mock_smtp.return_value.__enter__.return_value = mock_server
+    monkeypatch.setattr("src.email_sender.smtplib.SMTP", mock_smtp)
+    return mock_server
+
+
+@pytest.fixture
+def sleep_delays(monkeypatch):
+    """Replace time.sleep with a recorder and return the list of requested delays."""
+    delays = []
+    monkeypatch.setattr("src.email_sender.time.sleep", delays.append)
+    return delays
 
 
 class TestEmailSenderInit:
@@ -82,21 +142,20 @@ class TestSendSummaryEmail:
         mock_server.login.assert_called_once_with("test@test.com", "testpass")
         mock_server.send_message.assert_called_once()
 
-    @patch("src.email_sender.smtplib.SMTP")
-    @patch("src.email_sender.time.sleep")
-    def test_send_email_retry_on_failure(self, mock_sleep, mock_smtp):
-        """Test retry logic on transient failures."""
+    @pytest.mark.parametrize(
+        "failures,expected_delays",
+        [(0, []), (1, [1]), (2, [1, 2]), (3, [1, 2, 4])],
+    )
+    def test_send_email_retry_on_failure(
+        self, fake_smtp, sleep_delays, failures, expected_delays
+    ):
+        """Test retry logic waits 2^attempt seconds between transient failures."""
         from src.email_sender import EmailSender
 
-        mock_server = MagicMock()
-        mock_smtp.return_value.__enter__.return_value = mock_server
-
-        # Fail first two attempts, succeed on third
-        mock_server.send_message.side_effect = [
-            Exception("Connection error"),
-            Exception("Timeout"),
-            None,  # Success
-        ]
+        # Fail the first `failures` attempts, then succeed
+        fake_smtp.send_message.side_effect = [
+            Exception("Transient error")
+        ] * failures + [None]
 
         sender = EmailSender(
             smtp_server="smtp.test.com",
@@ -113,14 +172,13 @@ class TestSendSummaryEmail:
         }
 
         with patch("os.path.exists", return_value=False):
-            result = sender.send_summary_email(video_data, "Summary", "/tmp/audio.mp3")
+            result = sender.send_summary_email(
+                video_data, "Summary", "/tmp/audio.mp3", max_retries=4
+            )
 
         assert result is True
-        assert mock_server.send_message.call_count == 3
-        assert mock_sleep.call_count == 2
-        # Check exponential backoff: 2^0=1, 2^1=2
-        mock_sleep.assert_any_call(1)
-        mock_sleep.assert_any_call(2)
+        assert fake_smtp.send_message.call_count == failures + 1
+        assert sleep_delays == expected_delays
 
     @patch("src.email_sender.smtplib.SMTP")
     @patch("src.email_sender.time.sleep")
@@ -155,7 +213,7 @@ class TestSendSummaryEmail:
         assert mock_server.send_message.call_count == 3
 
     @patch("src.email_sender.smtplib.SMTP")
-    def test_send_email_with_audio_attachment(self, mock_smtp):
+    def test_send_email_with_audio_attachment(self, mock_smtp, with_audio):
         """Test email sending with audio file attachment."""
         from src.email_sender import EmailSender
 
@@ -176,33 +234,20 @@ class TestSendSummaryEmail:
             "channel_name": "Test Channel",
         }
 
-        # Mock file operations
-        mock_audio_data = b"fake audio data"
-        with patch("os.path.exists", return_value=True):
-            with patch("builtins.open", mock_open(read_data=mock_audio_data)):
-                result = sender.send_summary_email(
-                    video_data, "Summary", "/tmp/audio.mp3"
-                )
+        result = sender.send_summary_email(video_data, "Summary", "/tmp/audio.mp3")
 
         assert result is True
         mock_server.send_message.assert_called_once()
+        msg = mock_server.send_message.call_args[0][0]
+        assert msg.get_payload()[1].get_payload(decode=True) == FAKE_AUDIO_DATA
 
 
 class TestCreateMessage:
     """Tests for _create_message method."""
 
-    def test_create_message_basic(self):
+    @pytest.mark.usefixtures("without_audio")
+    def test_create_message_basic(self, email_sender):
         """Test basic message creation."""
-        from src.email_sender import EmailSender
-
-        sender = EmailSender(
-            smtp_server="smtp.test.com",
-            smtp_port=587,
-            username="test@test.com",
-            password="testpass",
-            recipient="recipient@test.com",
-        )
-
         video_data = {
             "video_id": "test123",
             "title": "Test Video Title",
@@ -210,85 +255,50 @@ class TestCreateMessage:
             "url": "https://youtube.com/watch?v=test123",
         }
 
-        with patch("os.path.exists", return_value=False):
-            msg = sender._create_message(video_data, "Test summary", "/tmp/audio.mp3")
+        msg = email_sender._create_message(video_data, "Test summary", "/tmp/audio.mp3")
 
         assert msg["Subject"] == "[Test Channel] Test Video Title"
         assert msg["To"] == "recipient@test.com"
         assert "YouTube Digest" in msg["From"]
 
-    def test_create_message_truncates_long_title(self):
+    @pytest.mark.usefixtures("without_audio")
+    def test_create_message_truncates_long_title(self, email_sender):
         """Test that long video titles are truncated in subject."""
-        from src.email_sender import EmailSender
-
-        sender = EmailSender(
-            smtp_server="smtp.test.com",
-            smtp_port=587,
-            username="test@test.com",
-            password="testpass",
-            recipient="recipient@test.com",
-        )
-
         video_data = {
             "video_id": "test123",
             "title": "A" * 100,  # Very long title
             "channel_name": "Test Channel",
         }
 
-        with patch("os.path.exists", return_value=False):
-            msg = sender._create_message(video_data, "Test summary", "/tmp/audio.mp3")
+        msg = email_sender._create_message(video_data, "Test summary", "/tmp/audio.mp3")
 
         # Title should be truncated to 50 chars + "..."
         assert "[Test Channel] " + "A" * 50 + "..." in msg["Subject"]
         assert len(msg["Subject"]) < 100
 
-    def test_create_message_with_default_channel_name(self):
+    @pytest.mark.usefixtures("without_audio")
+    def test_create_message_with_default_channel_name(self, email_sender):
         """Test message creation with missing channel name."""
-        from src.email_sender import EmailSender
-
-        sender = EmailSender(
-            smtp_server="smtp.test.com",
-            smtp_port=587,
-            username="test@test.com",
-            password="testpass",
-            recipient="recipient@test.com",
-        )
-
         video_data = {
             "video_id": "test123",
             "title": "Test Video",
             # No channel_name
         }
 
-        with patch("os.path.exists", return_value=False):
-            msg = sender._create_message(video_data, "Test summary", "/tmp/audio.mp3")
+        msg = email_sender._create_message(video_data, "Test summary", "/tmp/audio.mp3")
 
         assert "[Unknown Channel]" in msg["Subject"]
 
-    def test_create_message_with_audio_attachment(self):
+    @pytest.mark.usefixtures("with_audio")
+    def test_create_message_with_audio_attachment(self, email_sender):
         """Test message creation includes audio attachment."""
-        from src.email_sender import EmailSender
-
-        sender = EmailSender(
-            smtp_server="smtp.test.com",
-            smtp_port=587,
-            username="test@test.com",
-            password="testpass",
-            recipient="recipient@test.com",
-        )
-
         video_data = {
             "video_id": "test123",
             "title": "Test Video",
             "channel_name": "Test Channel",
         }
 
-        mock_audio_data = b"fake audio data"
-        with patch("os.path.exists", return_value=True):
-            with patch("builtins.open", mock_open(read_data=mock_audio_data)):
-                msg = sender._create_message(
-                    video_data, "Test summary", "/tmp/audio.mp3"
-                )
+        msg = email_sender._create_message(video_data, "Test summary", "/tmp/audio.mp3")
 
         # Check that message is multipart
         assert msg.is_multipart()
@@ -304,6 +314,7 @@ class TestCreateMessage:
                 # Check filename
                 content_disp = part.get("Content-Disposition")
                 assert "test123_summary.mp3" in content_disp
+                assert part.get_payload(decode=True) == FAKE_AUDIO_DATA
             elif content_type == "multipart/alternative":
                 # Check that alternative part has HTML and plain text
                 alt_payloads = part.get_payload()
@@ -389,9 +400,8 @@ class TestCreateHtmlBody:
         html = sender._create_html_body(video_data, "Summary with <html> tags")
 
         # Should escape HTML special characters
-        assert "&lt;script&gt;" in html
-        assert "&amp;" in html
-        assert "<script>" not in html
+        assert not _UNSAFE_RE.search(html)
+        assert set(_SAFE_RE.findall(html)) == {"&lt;script&gt;", "&amp;"}
 
 
 class TestCreatePlainTextBody:
@@ -505,7 +515,7 @@ class TestEmailLogging:
 
     @patch("src.email_sender.smtplib.SMTP")
     @patch("src.email_sender.logger")
-    def test_logs_audio_attachment(self, mock_logger, mock_smtp):
+    def test_logs_audio_attachment(self, mock_logger, mock_smtp, with_audio):
         """Test that audio attachment is logged."""
         from src.email_sender import EmailSender
 
@@ -526,10 +536,7 @@ class TestEmailLogging:
             "channel_name": "Test Channel",
         }
 
-        mock_audio_data = b"fake audio data"
-        with patch("os.path.exists", return_value=True):
-            with patch("builtins.open", mock_open(read_data=mock_audio_data)):
-                sender.send_summary_email(video_data, "Summary", "/tmp/audio.mp3")
+        sender.send_summary_email(video_data, "Summary", "/tmp/audio.mp3")
 
         info_calls = [call[0][0] for call in mock_logger.info.call_args_list]
         assert any("Attached audio file" in call for call in info_calls)
@@ -4,47 +4,93 @@ These tests use mocks to avoid making real API calls during testing.
 """
 
 import pytest
-from datetime import datetime, timezone
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import MagicMock, patch
 import logging
-
-
-@pytest.fixture(autouse=True)
+from types import MappingProxyType, SimpleNamespace
+
+import src.main as main_mod
+from src.database import Database
+from src.email_sender import EmailSender
+from src.main import main, run_pipeline, setup_logging
+from src.youtube_client import YouTubeClient
+from src.youtube_oauth import YouTubeOAuthClient
+
+
+# Canonical subscription and video records; read-only so tests can share them
+SUB1 = MappingProxyType({'channel_id': 'ch1', 'channel_name': 'Channel 1'})
+SUB2 = MappingProxyType({'channel_id': 'ch2', 'channel_name': 'Channel 2'})
+VID1 = MappingProxyType({
+    'video_id': 'vid1',
+    'title': 'Test Video',
+    'channel_id': 'ch1',
+    'channel_name': 'Channel 1'
+})
+CHANNEL_VIDEOS = tuple(
+    MappingProxyType({
+        'video_id': f'vid{i}',
+        'title': f'Video {i}',
+        'channel_id': 'ch1',
+        'channel_name': 'Channel 1'
+    })
+    for i in range(1, 4)
+)
+
+# Database.get_processing_stats result; only logged by run_pipeline
+_DEFAULT_STATS = MappingProxyType({
+    'total_videos': 0,
+    'processed_today': 0,
+    'processed_this_week': 0
+})
+
+
+@pytest.fixture
 def reset_logging():
-    """Reset logging configuration before and after each test."""
-    root_logger = logging.getLogger()
-    original_handlers = root_logger.handlers.copy()
-    original_level = root_logger.level
-
+    """Drop the handlers setup_logging installed and restore the default level."""
     yield
 
-    # Restore original state
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers:
+        handler.close()
     root_logger.handlers.clear()
-    for handler in original_handlers:
-        root_logger.addHandler(handler)
-    root_logger.setLevel(original_level)
+    root_logger.setLevel(logging.WARNING)
+
 
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    """Point setup_logging's file handler at a per-test directory.
 
+    Keeps parallel (xdist) workers from sharing logs/pipeline.log.
+    """
+    monkeypatch.setattr(main_mod, 'LOGS_DIR', str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.usefixtures('log_dir', 'reset_logging')
+@pytest.mark.xdist_group('logging_global_state')
 class TestSetupLogging:
     """Tests for setup_logging function."""
 
     def test_setup_logging_creates_handlers(self):
         """Test that logging is configured with console and file handlers."""
-        from src.main import setup_logging
-
         # Clear any existing handlers
         root_logger = logging.getLogger()
         root_logger.handlers.clear()
 
         setup_logging(verbose=False)
 
-        # Should have created handlers (console + file)
-        assert len(root_logger.handlers) >= 1  # At least console handler
+        # Exactly one console and one file handler - no duplicates
+        handlers = root_logger.handlers
+        assert len(handlers) == 2
+        # RotatingFileHandler is itself a StreamHandler, so exclude it explicitly
+        assert any(
+            isinstance(h, logging.StreamHandler)
+            and not isinstance(h, logging.FileHandler)
+            for h in handlers
+        )
+        assert any(isinstance(h, logging.FileHandler) for h in handlers)
 
     def test_setup_logging_verbose_sets_debug_level(self):
         """Test that verbose mode sets DEBUG logging level."""
-        from src.main import setup_logging
-
         root_logger = logging.getLogger()
         root_logger.handlers.clear()
 
@@ -54,8 +100,6 @@ class TestSetupLogging:
 
     def test_setup_logging_default_sets_info_level(self):
         """Test that default mode sets INFO logging level."""
-        from src.main import setup_logging
-
         root_logger = logging.getLogger()
         root_logger.handlers.clear()
 
@@ -64,178 +108,128 @@ class TestSetupLogging:
         assert root_logger.level == logging.INFO
 
 
+@pytest.fixture(scope='module')
+def shared_mocks():
+    """Build run_pipeline's collaborator mocks once per module.
+
+    Instances are spec'd from the real classes, so a renamed method fails
+    loudly instead of silently returning a fresh MagicMock.
+    """
+    return SimpleNamespace(
+        oauth=MagicMock(spec=YouTubeOAuthClient),
+        youtube=MagicMock(spec=YouTubeClient),
+        email=MagicMock(spec=EmailSender),
+        db=MagicMock(spec=Database),
+        transcript=MagicMock(),
+        summary=MagicMock(),
+    )
+
+
+@pytest.fixture
+def pipeline_mocks(shared_mocks, monkeypatch):
+    """Install the shared mocks as run_pipeline's collaborators.
+
+    Every mock is reset (including configured return values and side effects)
+    before the test, so nothing leaks between tests. The client classes are
+    replaced with factories returning the instance exposed on the namespace,
+    so tests configure e.g. ``pipeline_mocks.youtube.get_recent_videos_bulk``
+    directly. Videos default to a 10 minute duration so they pass the length
+    checks, and database stats default to ``_DEFAULT_STATS``.
+    """
+    mocks = shared_mocks
+    for mock in vars(mocks).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    mocks.youtube.get_video_duration.return_value = 600
+    mocks.db.get_processing_stats.return_value = _DEFAULT_STATS
+
+    monkeypatch.setattr(main_mod, 'YouTubeOAuthClient', lambda *args, **kwargs: mocks.oauth)
+    monkeypatch.setattr(main_mod, 'YouTubeClient', lambda *args, **kwargs: mocks.youtube)
+    monkeypatch.setattr(main_mod, 'EmailSender', lambda *args, **kwargs: mocks.email)
+    monkeypatch.setattr(main_mod, 'Database', lambda *args, **kwargs: mocks.db)
+    monkeypatch.setattr(main_mod, 'get_transcript', mocks.transcript)
+    monkeypatch.setattr(main_mod, 'create_summary_with_audio', mocks.summary)
+    return mocks
+
+
 class TestRunPipeline:
     """Tests for run_pipeline function."""
 
-    @patch('src.main.Database')
-    @patch('src.main.EmailSender')
-    @patch('src.main.YouTubeClient')
-    def test_run_pipeline_no_subscriptions(
-        self, mock_youtube_class, mock_email_class, mock_db_class
-    ):
+    def test_run_pipeline_no_subscriptions(self, pipeline_mocks):
         """Test pipeline with no subscriptions."""
-        from src.main import run_pipeline
-
-        # Setup mocks
-        mock_youtube = MagicMock()
-        mock_youtube.get_subscriptions.return_value = []
-        mock_youtube_class.return_value = mock_youtube
-
-        mock_db = MagicMock()
-        mock_db.get_processing_stats.return_value = {
-            'total_videos': 0,
-            'processed_today': 0,
-            'processed_this_week': 0
-        }
-        mock_db_class.return_value = mock_db
+        pipeline_mocks.oauth.get_subscriptions.return_value = []
 
         stats = run_pipeline(dry_run=True)
 
         assert stats['total_videos_found'] == 0
         assert stats['new_videos'] == 0
         assert stats['processed'] == 0
-        mock_youtube.get_subscriptions.assert_called_once()
-
-    @patch('src.main.get_transcript')
-    @patch('src.main.create_summary_with_audio')
-    @patch('src.main.Database')
-    @patch('src.main.EmailSender')
-    @patch('src.main.YouTubeClient')
-    def test_run_pipeline_processes_new_video(
-        self, mock_youtube_class, mock_email_class, mock_db_class,
-        mock_create_summary, mock_get_transcript
+        pipeline_mocks.oauth.get_subscriptions.assert_called_once()
+
+    @pytest.mark.parametrize(
+        'transcript,summary_side_effect,dry_run,expected_stats,expected_status,email_sent',
+        [
+            pytest.param(
+                "Test transcript", None, True,
+                {'processed': 1, 'failed': 0, 'skipped': 0}, 'completed', False,
+                id='processes_new_video_without_email_in_dry_run',
+            ),
+            pytest.param(
+                None, None, True,
+                {'processed': 0, 'skipped': 1}, 'skipped', False,
+                id='skips_video_without_transcript',
+            ),
+            pytest.param(
+                "Test transcript", None, False,
+                {'processed': 1, 'failed': 0}, 'completed', True,
+                id='sends_email_when_not_dry_run',
+            ),
+            pytest.param(
+                "Test transcript", Exception("API error"), True,
+                {'processed': 0, 'failed': 1}, 'failed', False,
+                id='handles_processing_error',
+            ),
+        ],
+    )
+    def test_run_pipeline_single_video(
+        self, pipeline_mocks, transcript, summary_side_effect, dry_run,
+        expected_stats, expected_status, email_sent
     ):
-        """Test pipeline successfully processes a new video."""
-        from src.main import run_pipeline
-
-        # Setup YouTube mock
-        mock_youtube = MagicMock()
-        mock_youtube.get_subscriptions.return_value = [
-            {'channel_id': 'ch1', 'channel_name': 'Channel 1'}
-        ]
-        mock_youtube.get_recent_videos.return_value = [
-            {
-                'video_id': 'vid1',
-                'title': 'Test Video',
-                'channel_id': 'ch1',
-                'channel_name': 'Channel 1'
-            }
-        ]
-        mock_youtube_class.return_value = mock_youtube
-
-        # Setup Database mock
-        mock_db = MagicMock()
-        mock_db.is_video_processed.return_value = False
-        mock_db.get_processing_stats.return_value = {
-            'total_videos': 1,
-            'processed_today': 1,
-            'processed_this_week': 1
-        }
-        mock_db_class.return_value = mock_db
-
-        # Setup transcript mock
-        mock_get_transcript.return_value = "This is a test transcript."
-
-        # Setup summarizer mock
-        mock_create_summary.return_value = {
+        """Test how one new video flows through transcript, summary and email."""
+        pipeline_mocks.oauth.get_subscriptions.return_value = [SUB1]
+        pipeline_mocks.youtube.get_recent_videos_bulk.return_value = {'ch1': [VID1]}
+        pipeline_mocks.db.is_video_processed.return_value = False
+        pipeline_mocks.transcript.return_value = transcript
+        pipeline_mocks.summary.return_value = {
             'summary': 'Test summary',
             'audio_path': '/tmp/audio.mp3'
         }
+        pipeline_mocks.summary.side_effect = summary_side_effect
 
-        stats = run_pipeline(dry_run=True)
+        stats = run_pipeline(dry_run=dry_run)
 
         assert stats['total_videos_found'] == 1
         assert stats['new_videos'] == 1
-        assert stats['processed'] == 1
-        assert stats['failed'] == 0
-        assert stats['skipped'] == 0
-
-        mock_get_transcript.assert_called_once_with('vid1')
-        mock_create_summary.assert_called_once()
-        mock_db.mark_video_processed.assert_called()
-
-    @patch('src.main.get_transcript')
-    @patch('src.main.Database')
-    @patch('src.main.EmailSender')
-    @patch('src.main.YouTubeClient')
-    def test_run_pipeline_skips_video_without_transcript(
-        self, mock_youtube_class, mock_email_class, mock_db_class,
-        mock_get_transcript
-    ):
-        """Test pipeline skips video when transcript is not available."""
-        from src.main import run_pipeline
-
-        # Setup YouTube mock
-        mock_youtube = MagicMock()
-        mock_youtube.get_subscriptions.return_value = [
-            {'channel_id': 'ch1', 'channel_name': 'Channel 1'}
-        ]
-        mock_youtube.get_recent_videos.return_value = [
-            {
-                'video_id': 'vid1',
-                'title': 'Test Video',
-                'channel_id': 'ch1',
-                'channel_name': 'Channel 1'
-            }
-        ]
-        mock_youtube_class.return_value = mock_youtube
-
-        # Setup Database mock
-        mock_db = MagicMock()
-        mock_db.is_video_processed.return_value = False
-        mock_db.get_processing_stats.return_value = {
-            'total_videos': 1,
-            'processed_today': 1,
-            'processed_this_week': 1
-        }
-        mock_db_class.return_value = mock_db
+        for key, value in expected_stats.items():
+            assert stats[key] == value
 
-        # No transcript available
-        mock_get_transcript.return_value = None
+        pipeline_mocks.transcript.assert_called_once_with('vid1')
+        assert pipeline_mocks.summary.called == (transcript is not None)
+        assert pipeline_mocks.email.send_summary_email.called == email_sent
 
-        stats = run_pipeline(dry_run=True)
-
-        assert stats['skipped'] == 1
-        assert stats['processed'] == 0
-
-        # Video should be marked as skipped
-        mock_db.mark_video_processed.assert_called_once()
-        call_args = mock_db.mark_video_processed.call_args
-        assert call_args[1]['status'] == 'skipped'
+        # Video should be marked exactly once with the outcome
+        pipeline_mocks.db.mark_video_processed.assert_called_once()
+        call_args = pipeline_mocks.db.mark_video_processed.call_args
+        assert call_args[1]['status'] == expected_status
+        if summary_side_effect is not None:
+            assert 'API error' in call_args[1]['error_message']
 
-    @patch('src.main.Database')
-    @patch('src.main.EmailSender')
-    @patch('src.main.YouTubeClient')
-    def test_run_pipeline_skips_already_processed_video(
-        self, mock_youtube_class, mock_email_class, mock_db_class
-    ):
+    def test_run_pipeline_skips_already_processed_video(self, pipeline_mocks):
         """Test pipeline skips videos that have already been processed."""
-        from src.main import run_pipeline
-
-        # Setup YouTube mock
-        mock_youtube = MagicMock()
-        mock_youtube.get_subscriptions.return_value = [
-            {'channel_id': 'ch1', 'channel_name': 'Channel 1'}
-        ]
-        mock_youtube.get_recent_videos.return_value = [
-            {
-                'video_id': 'vid1',
-                'title': 'Test Video',
-                'channel_id': 'ch1',
-                'channel_name': 'Channel 1'
-            }
-        ]
-        mock_youtube_class.return_value = mock_youtube
-
-        # Setup Database mock - video already processed
-        mock_db = MagicMock()
-        mock_db.is_video_processed.return_value = True
-        mock_db.get_processing_stats.return_value = {
-            'total_videos': 1,
-            'processed_today': 0,
-            'processed_this_week': 1
-        }
-        mock_db_class.return_value = mock_db
+        pipeline_mocks.oauth.get_subscriptions.return_value = [SUB1]
+        pipeline_mocks.youtube.get_recent_videos_bulk.return_value = {'ch1': [VID1]}
+
+        # Video already processed
+        pipeline_mocks.db.is_video_processed.return_value = True
 
         stats = run_pipeline(dry_run=True)
 
@@ -243,182 +237,26 @@ class TestRunPipeline:
         assert stats['new_videos'] == 0
         assert stats['processed'] == 0
 
-    @patch('src.main.get_transcript')
-    @patch('src.main.create_summary_with_audio')
-    @patch('src.main.Database')
-    @patch('src.main.EmailSender')
-    @patch('src.main.YouTubeClient')
-    def test_run_pipeline_sends_email_when_not_dry_run(
-        self, mock_youtube_class, mock_email_class, mock_db_class,
-        mock_create_summary, mock_get_transcript
-    ):
-        """Test pipeline sends email when not in dry run mode."""
-        from src.main import run_pipeline
-
-        # Setup mocks
-        mock_youtube = MagicMock()
-        mock_youtube.get_subscriptions.return_value = [
-            {'channel_id': 'ch1', 'channel_name': 'Channel 1'}
-        ]
-        mock_youtube.get_recent_videos.return_value = [
-            {
-                'video_id': 'vid1',
-                'title': 'Test Video',
-                'channel_id': 'ch1',
-                'channel_name': 'Channel 1'
-            }
-        ]
-        mock_youtube_class.return_value = mock_youtube
-
-        mock_email = MagicMock()
-        mock_email_class.return_value = mock_email
-
-        mock_db = MagicMock()
-        mock_db.is_video_processed.return_value = False
-        mock_db.get_processing_stats.return_value = {
-            'total_videos': 1,
-            'processed_today': 1,
-            'processed_this_week': 1
-        }
-        mock_db_class.return_value = mock_db
-
-        mock_get_transcript.return_value = "Test transcript"
-        mock_create_summary.return_value = {
-            'summary': 'Test summary',
-            'audio_path': '/tmp/audio.mp3'
-        }
-
-        run_pipeline(dry_run=False)
-
-        mock_email.send_summary_email.assert_called_once()
-
-    @patch('src.main.get_transcript')
-    @patch('src.main.create_summary_with_audio')
-    @patch('src.main.Database')
-    @patch('src.main.EmailSender')
-    @patch('src.main.YouTubeClient')
-    def test_run_pipeline_does_not_send_email_in_dry_run(
-        self, mock_youtube_class, mock_email_class, mock_db_class,
-        mock_create_summary, mock_get_transcript
-    ):
-        """Test pipeline does not send email in dry run mode."""
-        from src.main import run_pipeline
-
-        # Setup mocks
-        mock_youtube = MagicMock()
-        mock_youtube.get_subscriptions.return_value = [
-            {'channel_id': 'ch1', 'channel_name': 'Channel 1'}
-        ]
-        mock_youtube.get_recent_videos.return_value = [
-            {
-                'video_id': 'vid1',
-                'title': 'Test Video',
-                'channel_id': 'ch1',
-                'channel_name': 'Channel 1'
-            }
-        ]
-        mock_youtube_class.return_value = mock_youtube
-
-        mock_email = MagicMock()
-        mock_email_class.return_value = mock_email
-
-        mock_db = MagicMock()
-        mock_db.is_video_processed.return_value = False
-        mock_db.get_processing_stats.return_value = {
-            'total_videos': 1,
-            'processed_today': 1,
-            'processed_this_week': 1
-        }
-        mock_db_class.return_value = mock_db
-
-        mock_get_transcript.return_value = "Test transcript"
-        mock_create_summary.return_value = {
-            'summary': 'Test summary',
-            'audio_path': '/tmp/audio.mp3'
-        }
-
-        run_pipeline(dry_run=True)
-
-        mock_email.send_summary_email.assert_not_called()
-
-    @patch('src.main.get_transcript')
-    @patch('src.main.create_summary_with_audio')
-    @patch('src.main.Database')
-    @patch('src.main.EmailSender')
-    @patch('src.main.YouTubeClient')
-    def test_run_pipeline_handles_processing_error(
-        self, mock_youtube_class, mock_email_class, mock_db_class,
-        mock_create_summary, mock_get_transcript
-    ):
-        """Test pipeline handles processing errors gracefully."""
-        from src.main import run_pipeline
-
-        # Setup mocks
-        mock_youtube = MagicMock()
-        mock_youtube.get_subscriptions.return_value = [
-            {'channel_id': 'ch1', 'channel_name': 'Channel 1'}
-        ]
-        mock_youtube.get_recent_videos.return_value = [
-            {
-                'video_id': 'vid1',
-                'title': 'Test Video',
-                'channel_id': 'ch1',
-                'channel_name': 'Channel 1'
-            }
-        ]
-        mock_youtube_class.return_value = mock_youtube
-
-        mock_db = MagicMock()
-        mock_db.is_video_processed.return_value = False
-        mock_db.get_processing_stats.return_value = {
-            'total_videos': 1,
-            'processed_today': 0,
-            'processed_this_week': 1
+    def test_run_pipeline_counts_videos_per_channel(self, pipeline_mocks):
+        """Test pipeline collects each subscription's videos from the bulk scan."""
+        pipeline_mocks.oauth.get_subscriptions.return_value = [SUB1, SUB2]
+        # ch2 failed inside the bulk scan, which maps it to []
+        pipeline_mocks.youtube.get_recent_videos_bulk.return_value = {
+            'ch1': list(CHANNEL_VIDEOS),
+            'ch2': [],
         }
-        mock_db_class.return_value = mock_db
-
-        mock_get_transcript.return_value = "Test transcript"
-        mock_create_summary.side_effect = Exception("API error")
+        pipeline_mocks.db.is_video_processed.return_value = True
 
         stats = run_pipeline(dry_run=True)
 
-        assert stats['failed'] == 1
-        assert stats['processed'] == 0
+        assert stats['total_videos_found'] == len(CHANNEL_VIDEOS)
 
-        # Video should be marked as failed
-        mock_db.mark_video_processed.assert_called_once()
-        call_args = mock_db.mark_video_processed.call_args
-        assert call_args[1]['status'] == 'failed'
-        assert 'API error' in call_args[1]['error_message']
-
-    @patch('src.main.Database')
-    @patch('src.main.EmailSender')
-    @patch('src.main.YouTubeClient')
-    def test_run_pipeline_handles_channel_fetch_error(
-        self, mock_youtube_class, mock_email_class, mock_db_class
-    ):
-        """Test pipeline continues when fetching from one channel fails."""
-        from src.main import run_pipeline
-
-        # Setup YouTube mock - first channel succeeds, second fails
-        mock_youtube = MagicMock()
-        mock_youtube.get_subscriptions.return_value = [
-            {'channel_id': 'ch1', 'channel_name': 'Channel 1'},
-            {'channel_id': 'ch2', 'channel_name': 'Channel 2'}
-        ]
-        mock_youtube.get_recent_videos.side_effect = [
-            [],  # First channel returns no videos
-            Exception("Network error")  # Second channel fails
-        ]
-        mock_youtube_class.return_value = mock_youtube
-
-        mock_db = MagicMock()
-        mock_db.get_processing_stats.return_value = {
-            'total_videos': 0,
-            'processed_today': 0,
-            'processed_this_week': 0
-        }
-        mock_db_class.return_value = mock_db
+    def test_run_pipeline_handles_channel_fetch_error(self, pipeline_mocks):
+        """Test pipeline continues when the channel scan itself fails."""
+        pipeline_mocks.oauth.get_subscriptions.return_value = [SUB1, SUB2]
+        pipeline_mocks.youtube.get_recent_videos_bulk.side_effect = Exception(
+            "Network error"
+        )
 
         # Should not raise exception
         stats = run_pipeline(dry_run=True)
@@ -426,82 +264,69 @@ class TestRunPipeline:
         # Pipeline should continue despite the error
         assert stats['total_videos_found'] == 0
 
-    @patch('src.main.get_transcript')
-    @patch('src.main.create_summary_with_audio')
-    @patch('src.main.Database')
-    @patch('src.main.EmailSender')
-    @patch('src.main.YouTubeClient')
-    def test_run_pipeline_uses_hours_parameter(
-        self, mock_youtube_class, mock_email_class, mock_db_class,
-        mock_create_summary, mock_get_transcript
-    ):
-        """Test pipeline passes hours parameter to get_recent_videos."""
-        from src.main import run_pipeline
-
-        mock_youtube = MagicMock()
-        mock_youtube.get_subscriptions.return_value = [
-            {'channel_id': 'ch1', 'channel_name': 'Channel 1'}
-        ]
-        mock_youtube.get_recent_videos.return_value = []
-        mock_youtube_class.return_value = mock_youtube
-
-        mock_db = MagicMock()
-        mock_db.get_processing_stats.return_value = {
-            'total_videos': 0,
-            'processed_today': 0,
-            'processed_this_week': 0
-        }
-        mock_db_class.return_value = mock_db
+    def test_run_pipeline_uses_hours_parameter(self, pipeline_mocks):
+        """Test pipeline passes hours parameter to get_recent_videos_bulk."""
+        pipeline_mocks.oauth.get_subscriptions.return_value = [SUB1]
+        pipeline_mocks.youtube.get_recent_videos_bulk.return_value = {'ch1': []}
 
         run_pipeline(dry_run=True, hours=48)
 
-        mock_youtube.get_recent_videos.assert_called_once_with('ch1', hours=48)
+        pipeline_mocks.youtube.get_recent_videos_bulk.assert_called_once_with(
+            ['ch1'], hours=48
+        )
 
 
 class TestMain:
     """Tests for main CLI function."""
 
-    @patch('src.main.validate_config')
-    @patch('src.main.run_pipeline')
-    @patch('src.main.setup_logging')
-    def test_main_returns_zero_on_success(
-        self, mock_setup_logging, mock_run_pipeline, mock_validate_config
+    @pytest.mark.parametrize(
+        'argv,expected_dry_run,expected_hours,expected_limit,expected_verbose',
+        [
+            (['--dry-run'], True, 24, 30, False),
+            (['--hours', '48'], False, 48, 30, False),
+            (['--limit', '60'], False, 24, 60, False),
+            (['--verbose'], False, 24, 30, True),
+            ([], False, 24, 30, False),
+        ],
+    )
+    @patch.object(main_mod, 'validate_config')
+    @patch.object(main_mod, 'run_pipeline')
+    def test_main_parses_arguments(
+        self, mock_run_pipeline, mock_validate_config, mock_setup_logging,
+        argv, expected_dry_run, expected_hours, expected_limit, expected_verbose
     ):
-        """Test main returns 0 on successful execution."""
-        from src.main import main
-
-        mock_run_pipeline.return_value = {'processed': 1}
+        """Test main passes parsed arguments through and returns 0 on success."""
+        mock_run_pipeline.return_value = {'processed': 0}
 
-        exit_code = main(['--dry-run'])
+        exit_code = main(argv)
 
         assert exit_code == 0
         mock_validate_config.assert_called_once()
-        mock_run_pipeline.assert_called_once_with(dry_run=True, hours=24)
-
-    @patch('src.main.validate_config')
-    @patch('src.main.run_pipeline')
-    @patch('src.main.setup_logging')
+        mock_setup_logging.assert_called_once_with(verbose=expected_verbose)
+        mock_run_pipeline.assert_called_once_with(
+            dry_run=expected_dry_run,
+            hours=expected_hours,
+            max_duration_minutes=expected_limit
+        )
+
+    @patch.object(main_mod, 'validate_config')
+    @patch.object(main_mod, 'run_pipeline')
     def test_main_returns_one_on_failure(
-        self, mock_setup_logging, mock_run_pipeline, mock_validate_config
+        self, mock_run_pipeline, mock_validate_config
     ):
         """Test main returns 1 on failure."""
-        from src.main import main
-
         mock_run_pipeline.side_effect = Exception("Pipeline error")
 
         exit_code = main(['--dry-run'])
 
         assert exit_code == 1
 
-    @patch('src.main.validate_config')
-    @patch('src.main.run_pipeline')
-    @patch('src.main.setup_logging')
+    @patch.object(main_mod, 'validate_config')
+    @patch.object(main_mod, 'run_pipeline')
     def test_main_returns_one_on_config_error(
-        self, mock_setup_logging, mock_run_pipeline, mock_validate_config
+        self, mock_run_pipeline, mock_validate_config
     ):
         """Test main returns 1 on configuration error."""
-        from src.main import main
-
         mock_validate_config.side_effect = ValueError("Missing API key")
 
         exit_code = main(['--dry-run'])
@@ -509,151 +334,66 @@ class TestMain:
         assert exit_code == 1
         mock_run_pipeline.assert_not_called()
 
-    @patch('src.main.validate_config')
-    @patch('src.main.run_pipeline')
-    @patch('src.main.setup_logging')
-    def test_main_parses_hours_argument(
-        self, mock_setup_logging, mock_run_pipeline, mock_validate_config
-    ):
-        """Test main correctly parses --hours argument."""
-        from src.main import main
-
-        mock_run_pipeline.return_value = {'processed': 0}
-
-        main(['--hours', '48'])
-
-        mock_run_pipeline.assert_called_once_with(dry_run=False, hours=48)
-
-    @patch('src.main.validate_config')
-    @patch('src.main.run_pipeline')
-    @patch('src.main.setup_logging')
-    def test_main_parses_verbose_argument(
-        self, mock_setup_logging, mock_run_pipeline, mock_validate_config
-    ):
-        """Test main correctly parses --verbose argument."""
-        from src.main import main
-
-        mock_run_pipeline.return_value = {'processed': 0}
-
-        main(['--verbose'])
-
-        mock_setup_logging.assert_called_once_with(verbose=True)
-
-    @patch('src.main.validate_config')
-    @patch('src.main.run_pipeline')
-    @patch('src.main.setup_logging')
-    def test_main_default_arguments(
-        self, mock_setup_logging, mock_run_pipeline, mock_validate_config
-    ):
-        """Test main uses correct default arguments."""
-        from src.main import main
-
-        mock_run_pipeline.return_value = {'processed': 0}
-
-        main([])
-
-        mock_setup_logging.assert_called_once_with(verbose=False)
-        mock_run_pipeline.assert_called_once_with(dry_run=False, hours=24)
-
 
 class TestPipelineIntegration:
     """Integration tests for pipeline components."""
 
-    @patch('src.main.get_transcript')
-    @patch('src.main.create_summary_with_audio')
-    @patch('src.main.Database')
-    @patch('src.main.EmailSender')
-    @patch('src.main.YouTubeClient')
+    @pytest.mark.parametrize('n_videos', [1, 3])
     def test_pipeline_processes_multiple_videos(
-        self, mock_youtube_class, mock_email_class, mock_db_class,
-        mock_create_summary, mock_get_transcript
+        self, pipeline_mocks, monkeypatch, n_videos
     ):
         """Test pipeline processes multiple videos correctly."""
-        from src.main import run_pipeline
-
-        # Setup YouTube mock with multiple videos
-        mock_youtube = MagicMock()
-        mock_youtube.get_subscriptions.return_value = [
-            {'channel_id': 'ch1', 'channel_name': 'Channel 1'}
-        ]
-        mock_youtube.get_recent_videos.return_value = [
-            {'video_id': 'vid1', 'title': 'Video 1', 'channel_id': 'ch1',
-             'channel_name': 'Channel 1'},
-            {'video_id': 'vid2', 'title': 'Video 2', 'channel_id': 'ch1',
-             'channel_name': 'Channel 1'},
-            {'video_id': 'vid3', 'title': 'Video 3', 'channel_id': 'ch1',
-             'channel_name': 'Channel 1'}
-        ]
-        mock_youtube_class.return_value = mock_youtube
-
-        mock_db = MagicMock()
-        mock_db.is_video_processed.return_value = False
-        mock_db.get_processing_stats.return_value = {
-            'total_videos': 3,
-            'processed_today': 3,
-            'processed_this_week': 3
+        pipeline_mocks.oauth.get_subscriptions.return_value = [SUB1]
+        pipeline_mocks.youtube.get_recent_videos_bulk.return_value = {
+            'ch1': list(CHANNEL_VIDEOS[:n_videos])
         }
-        mock_db_class.return_value = mock_db
+        pipeline_mocks.db.is_video_processed.return_value = False
 
-        mock_get_transcript.return_value = "Test transcript"
-        mock_create_summary.return_value = {
-            'summary': 'Test summary',
-            'audio_path': '/tmp/audio.mp3'
-        }
+        # Plain functions instead of MagicMocks for the per-video calls
+        transcript_ids = []
+        summary_ids = []
+
+        def fake_get_transcript(video_id):
+            transcript_ids.append(video_id)
+            return "Test transcript"
+
+        def fake_create_summary(**kwargs):
+            summary_ids.append(kwargs['video_id'])
+            return {'summary': 'Test summary', 'audio_path': '/tmp/audio.mp3'}
+
+        monkeypatch.setattr(main_mod, 'get_transcript', fake_get_transcript)
+        monkeypatch.setattr(main_mod, 'create_summary_with_audio', fake_create_summary)
 
         stats = run_pipeline(dry_run=True)
 
-        assert stats['total_videos_found'] == 3
-        assert stats['new_videos'] == 3
-        assert stats['processed'] == 3
-        assert mock_get_transcript.call_count == 3
-        assert mock_create_summary.call_count == 3
-
-    @patch('src.main.get_transcript')
-    @patch('src.main.create_summary_with_audio')
-    @patch('src.main.Database')
-    @patch('src.main.EmailSender')
-    @patch('src.main.YouTubeClient')
-    def test_pipeline_handles_mixed_success_and_failure(
-        self, mock_youtube_class, mock_email_class, mock_db_class,
-        mock_create_summary, mock_get_transcript
-    ):
+        expected_ids = [video['video_id'] for video in CHANNEL_VIDEOS[:n_videos]]
+        assert stats['total_videos_found'] == n_videos
+        assert stats['new_videos'] == n_videos
+        assert stats['processed'] == n_videos
+        assert transcript_ids == expected_ids
+        assert summary_ids == expected_ids
+
+    def test_pipeline_handles_mixed_success_and_failure(self, pipeline_mocks):
         """Test pipeline correctly handles mix of successes and failures."""
-        from src.main import run_pipeline
-
-        mock_youtube = MagicMock()
-        mock_youtube.get_subscriptions.return_value = [
-            {'channel_id': 'ch1', 'channel_name': 'Channel 1'}
-        ]
-        mock_youtube.get_recent_videos.return_value = [
-            {'video_id': 'vid1', 'title': 'Video 1', 'channel_id': 'ch1',
-             'channel_name': 'Channel 1'},
-            {'video_id': 'vid2', 'title': 'Video 2', 'channel_id': 'ch1',
-             'channel_name': 'Channel 1'},
-            {'video_id': 'vid3', 'title': 'Video 3', 'channel_id': 'ch1',
-             'channel_name': 'Channel 1'}
-        ]
-        mock_youtube_class.return_value = mock_youtube
-
-        mock_db = MagicMock()
-        mock_db.is_video_processed.return_value = False
-        mock_db.get_processing_stats.return_value = {
-            'total_videos': 3,
-            'processed_today': 2,
-            'processed_this_week': 3
+        pipeline_mocks.oauth.get_subscriptions.return_value = [SUB1]
+        pipeline_mocks.youtube.get_recent_videos_bulk.return_value = {
+            'ch1': list(CHANNEL_VIDEOS)
         }
-        mock_db_class.return_value = mock_db
+        pipeline_mocks.db.is_video_processed.return_value = False
 
         # First has transcript, second has none, third has error
-        mock_get_transcript.side_effect = [
-            "Test transcript",
-            None,
-            "Test transcript"
-        ]
-        mock_create_summary.side_effect = [
-            {'summary': 'Test summary', 'audio_path': '/tmp/audio.mp3'},
-            Exception("API error")
-        ]
+        pipeline_mocks.transcript.side_effect = {
+            'vid1': "Test transcript",
+            'vid2': None,
+            'vid3': "Test transcript",
+        }.__getitem__
+
+        def fake_create_summary(**kwargs):
+            if kwargs['video_id'] == 'vid3':
+                raise Exception("API error")
+            return {'summary': 'Test summary', 'audio_path': '/tmp/audio.mp3'}
+
+        pipeline_mocks.summary.side_effect = fake_create_summary
 
         stats = run_pipeline(dry_run=True)
 
@@ -0,0 +1,86 @@
+"""Unit tests for the client-side rate limiter."""
+
+import pytest
+
+
+class FakeClock:
+    """Manual clock whose sleep() advances time instead of blocking."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    def test_acquire_within_budget_does_not_wait(self, clock):
+        """Test that requests within both budgets pass immediately."""
+        from src.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(60, 1000, clock=clock, sleep=clock.sleep)
+
+        for _ in range(3):
+            assert limiter.acquire(100) == 0.0
+        assert clock.sleeps == []
+
+    def test_acquire_waits_for_request_budget(self, clock):
+        """Test that exhausting requests waits for one request to refill."""
+        from src.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(2, 1000, clock=clock, sleep=clock.sleep)
+        limiter.acquire()
+        limiter.acquire()
+
+        waited = limiter.acquire()
+
+        # 2 requests/minute refill one request every 30 seconds
+        assert waited == pytest.approx(30.0)
+
+    def test_acquire_waits_for_token_budget(self, clock):
+        """Test that a large token reservation waits for tokens to refill."""
+        from src.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(100, 600, clock=clock, sleep=clock.sleep)
+        limiter.acquire(500)
+
+        waited = limiter.acquire(200)
+
+        # 100 tokens remain; 100 more refill at 10 tokens/second
+        assert waited == pytest.approx(10.0)
+
+    def test_oversized_request_waits_for_full_bucket(self, clock):
+        """Test that requests above the token budget are capped, not stuck."""
+        from src.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(100, 600, clock=clock, sleep=clock.sleep)
+        limiter.acquire(600)
+
+        waited = limiter.acquire(10_000)
+
+        assert waited == pytest.approx(60.0)
+
+    def test_idle_refill_is_capped_at_budget(self, clock):
+        """Test that idle time does not bank more than one minute of budget."""
+        from src.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(2, 1000, clock=clock, sleep=clock.sleep)
+        clock.now += 3600
+
+        limiter.acquire()
+        limiter.acquire()
+        waited = limiter.acquire()
+
+        assert waited == pytest.approx(30.0)
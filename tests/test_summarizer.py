@@ -4,9 +4,77 @@ These tests use mocks to avoid making real OpenAI API calls during testing.
 """
 
 import os
+from dataclasses import dataclass
+
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 
+from src import summarizer
+from src.config import OPENAI_MODEL
+from src.summarizer import (
+    OPENAI_TTS_VOICE,
+    SUMMARY_MAX_TOKENS,
+    SUMMARY_MODEL,
+    SUMMARY_PROMPT_CACHE_KEY,
+    SUMMARY_SYSTEM_PROMPT,
+    chunk_transcript,
+    create_summary_with_audio,
+    generate_audio_narration,
+    generate_audio_narrations,
+    summarize_long_transcript,
+    summarize_transcript,
+)
+
+
+# Plain stand-ins for OpenAI response objects; attribute access on these is
+# far cheaper than on nested MagicMocks, which create child mocks on demand.
+@dataclass(frozen=True, slots=True)
+class FakeUsage:
+    total_tokens: int
+    prompt_tokens: int
+    completion_tokens: int
+
+
+@dataclass(frozen=True, slots=True)
+class FakeMessage:
+    content: str
+
+
+@dataclass(frozen=True, slots=True)
+class FakeChoice:
+    message: FakeMessage
+
+
+@dataclass(frozen=True, slots=True)
+class FakeResponse:
+    choices: list
+    usage: FakeUsage
+
+
+@dataclass(frozen=True, slots=True)
+class FakeResponsesUsage:
+    total_tokens: int
+    input_tokens: int
+    output_tokens: int
+
+
+@dataclass(frozen=True, slots=True)
+class FakeResponsesResponse:
+    output_text: str
+    usage: FakeResponsesUsage
+
+
+def _chat_response(content, total_tokens=100, prompt_tokens=90, completion_tokens=10):
+    """Build a chat completion response with a single choice."""
+    return FakeResponse(
+        choices=[FakeChoice(FakeMessage(content))],
+        usage=FakeUsage(total_tokens, prompt_tokens, completion_tokens),
+    )
+
+
+# Shared across tests; the fakes are frozen, so no test can alter them
+SUMMARY_RESPONSE = _chat_response("Summary")
+
 
 class TestSummarizeTranscript:
     """Tests for summarize_transcript function."""
@@ -14,24 +82,17 @@ class TestSummarizeTranscript:
     @patch('src.summarizer.get_openai_client')
     def test_summarize_transcript_success(self, mock_get_client):
         """Test successful transcript summarization."""
-        from src.summarizer import summarize_transcript
-
         # Setup mock client
         mock_client = MagicMock()
         mock_get_client.return_value = mock_client
 
         # Setup mock response - reflects restatement approach
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = (
+        mock_client.chat.completions.create.return_value = _chat_response(
             "The speaker discusses AI development and emphasizes data quality. "
             "They explain that starting with small experiments is important. "
-            "The video covers practical approaches to machine learning projects."
+            "The video covers practical approaches to machine learning projects.",
+            1500, 1400, 100
         )
-        mock_response.usage.total_tokens = 1500
-        mock_response.usage.prompt_tokens = 1400
-        mock_response.usage.completion_tokens = 100
-        mock_client.chat.completions.create.return_value = mock_response
 
         result = summarize_transcript(
             "Sample transcript about AI...",
@@ -46,18 +107,11 @@ class TestSummarizeTranscript:
     @patch('src.summarizer.get_openai_client')
     def test_summarize_transcript_without_url(self, mock_get_client):
         """Test summarization without optional video URL."""
-        from src.summarizer import summarize_transcript
-
         mock_client = MagicMock()
         mock_get_client.return_value = mock_client
-
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Test summary."
-        mock_response.usage.total_tokens = 500
-        mock_response.usage.prompt_tokens = 450
-        mock_response.usage.completion_tokens = 50
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = _chat_response(
+            "Test summary.", 500, 450, 50
+        )
 
         result = summarize_transcript(
             "Sample transcript",
@@ -69,8 +123,6 @@ class TestSummarizeTranscript:
     @patch('src.summarizer.get_openai_client')
     def test_summarize_transcript_api_error(self, mock_get_client):
         """Test error handling when API call fails."""
-        from src.summarizer import summarize_transcript
-
         mock_client = MagicMock()
         mock_get_client.return_value = mock_client
         mock_client.chat.completions.create.side_effect = Exception("API Error")
@@ -81,41 +133,23 @@ class TestSummarizeTranscript:
     @patch('src.summarizer.get_openai_client')
     def test_summarize_transcript_uses_correct_model(self, mock_get_client):
         """Test that the correct GPT model is used."""
-        from src.summarizer import summarize_transcript
-
         mock_client = MagicMock()
         mock_get_client.return_value = mock_client
-
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Summary"
-        mock_response.usage.total_tokens = 100
-        mock_response.usage.prompt_tokens = 90
-        mock_response.usage.completion_tokens = 10
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = SUMMARY_RESPONSE
 
         summarize_transcript("Test", "Title")
 
         call_args = mock_client.chat.completions.create.call_args
-        assert call_args.kwargs['model'] == "gpt-4-turbo-preview"
+        assert call_args.kwargs['model'] == OPENAI_MODEL
         assert call_args.kwargs['temperature'] == 0.7
-        assert call_args.kwargs['max_tokens'] == 500
+        assert call_args.kwargs['max_tokens'] == SUMMARY_MAX_TOKENS
 
     @patch('src.summarizer.get_openai_client')
     def test_summarize_transcript_uses_restatement_prompt(self, mock_get_client):
         """Test that the prompt focuses on restating content rather than interpreting."""
-        from src.summarizer import summarize_transcript
-
         mock_client = MagicMock()
         mock_get_client.return_value = mock_client
-
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Summary"
-        mock_response.usage.total_tokens = 100
-        mock_response.usage.prompt_tokens = 90
-        mock_response.usage.completion_tokens = 10
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = SUMMARY_RESPONSE
 
         summarize_transcript("Test transcript content", "Test Title")
 
@@ -135,19 +169,105 @@ class TestSummarizeTranscript:
         assert "without adding interpretation" in user_message.lower()
 
 
+@patch('src.summarizer.OPENAI_USE_RESPONSES_API', True)
+class TestSummarizeTranscriptResponses:
+    """Tests for summarize_transcript on the Responses API path."""
+
+    @staticmethod
+    def _mock_responses_client(mock_get_client, text="Responses summary."):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.responses.create.return_value = FakeResponsesResponse(
+            text, FakeResponsesUsage(1000, 900, 100)
+        )
+        return mock_client
+
+    @patch('src.summarizer.get_openai_client')
+    def test_summarize_uses_responses_api(self, mock_get_client):
+        """Test that the flag routes summarization through responses.create."""
+        mock_client = self._mock_responses_client(mock_get_client)
+
+        result = summarize_transcript("Transcript content", "Title")
+
+        assert result == "Responses summary."
+        mock_client.chat.completions.create.assert_not_called()
+        call_kwargs = mock_client.responses.create.call_args.kwargs
+        assert call_kwargs['model'] == SUMMARY_MODEL
+        assert call_kwargs['instructions'] == SUMMARY_SYSTEM_PROMPT
+        assert "Transcript content" in call_kwargs['input']
+        assert call_kwargs['max_output_tokens'] == SUMMARY_MAX_TOKENS
+        assert call_kwargs['prompt_cache_key'] == SUMMARY_PROMPT_CACHE_KEY
+        assert call_kwargs['store'] is False
+
+    @patch('src.summarizer.logger')
+    @patch('src.summarizer.get_openai_client')
+    def test_summarize_logs_responses_usage(self, mock_get_client, mock_logger):
+        """Test that Responses API usage fields feed the cost log."""
+        self._mock_responses_client(mock_get_client)
+
+        summarize_transcript("Test", "Title")
+
+        log_call = mock_logger.info.call_args[0][0]
+        assert "1000 tokens" in log_call
+        assert "input: 900, output: 100" in log_call
+
+
+class TestOpenAIClient:
+    """Tests for get_openai_client and request throttling."""
+
+    @patch('openai.OpenAI')
+    def test_get_openai_client_configures_retries(self, mock_openai, monkeypatch):
+        """Test that the client is built once with the configured retry count."""
+        monkeypatch.setattr(summarizer, "OPENAI_API_KEY", "test-key")
+
+        first = summarizer.get_openai_client()
+        second = summarizer.get_openai_client()
+
+        assert first is second
+        mock_openai.assert_called_once_with(
+            api_key="test-key", max_retries=summarizer.OPENAI_MAX_RETRIES
+        )
+
+    @patch('src.summarizer._chat_rate_limiter')
+    @patch('src.summarizer.get_openai_client')
+    def test_summarize_transcript_reserves_rate_limit(
+        self, mock_get_client, mock_limiter
+    ):
+        """Test that each summary reserves its prompt and completion tokens."""
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.chat.completions.create.return_value = SUMMARY_RESPONSE
+
+        summarize_transcript("Test transcript", "Title")
+
+        mock_limiter.acquire.assert_called_once()
+        assert mock_limiter.acquire.call_args[0][0] > SUMMARY_MAX_TOKENS
+
+
+def _mock_tts_client(mock_get_client, chunks=(b"ID3", b"audio")):
+    """Wire a mock client whose streaming TTS response yields ``chunks``.
+
+    Returns the client and the response object bound by the ``with`` block.
+    """
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+    streaming_create = mock_client.audio.speech.with_streaming_response.create
+    mock_response = streaming_create.return_value.__enter__.return_value
+    mock_response.iter_bytes.return_value = iter(chunks)
+    return mock_client, mock_response
+
+
 class TestGenerateAudioNarration:
     """Tests for generate_audio_narration function."""
 
+    @patch('src.summarizer.open', new_callable=mock_open, create=True)
     @patch('src.summarizer.get_openai_client')
     @patch('src.summarizer.os.makedirs')
-    def test_generate_audio_narration_success(self, mock_makedirs, mock_get_client):
+    def test_generate_audio_narration_success(
+        self, mock_makedirs, mock_get_client, mock_file
+    ):
         """Test successful audio narration generation."""
-        from src.summarizer import generate_audio_narration
-
-        mock_client = MagicMock()
-        mock_get_client.return_value = mock_client
-        mock_response = MagicMock()
-        mock_client.audio.speech.create.return_value = mock_response
+        mock_client, mock_response = _mock_tts_client(mock_get_client)
 
         result = generate_audio_narration(
             "This is a test summary.",
@@ -157,42 +277,38 @@ class TestGenerateAudioNarration:
 
         assert result == "/tmp/test_audio/test123_summary.mp3"
         mock_makedirs.assert_called_once_with("/tmp/test_audio", exist_ok=True)
-        mock_response.stream_to_file.assert_called_once_with(
-            "/tmp/test_audio/test123_summary.mp3"
-        )
+        mock_client.audio.speech.with_streaming_response.create.assert_called_once()
+        mock_response.iter_bytes.assert_called_once_with(chunk_size=4096)
+        mock_file.assert_called_once_with("/tmp/test_audio/test123_summary.mp3", "wb")
+        handle = mock_file.return_value
+        assert [c.args[0] for c in handle.write.call_args_list] == [b"ID3", b"audio"]
 
+    @patch('src.summarizer.open', new_callable=mock_open, create=True)
     @patch('src.summarizer.get_openai_client')
     @patch('src.summarizer.os.makedirs')
-    def test_generate_audio_narration_default_dir(self, mock_makedirs, mock_get_client):
+    def test_generate_audio_narration_default_dir(
+        self, mock_makedirs, mock_get_client, mock_file
+    ):
         """Test audio generation with default output directory."""
-        from src.summarizer import generate_audio_narration
-
-        mock_client = MagicMock()
-        mock_get_client.return_value = mock_client
-        mock_response = MagicMock()
-        mock_client.audio.speech.create.return_value = mock_response
+        _mock_tts_client(mock_get_client)
 
         result = generate_audio_narration("Test summary.", "vid456")
 
         assert result == "data/audio/vid456_summary.mp3"
         mock_makedirs.assert_called_once_with("data/audio", exist_ok=True)
 
+    @patch('src.summarizer.open', new_callable=mock_open, create=True)
     @patch('src.summarizer.get_openai_client')
     @patch('src.summarizer.os.makedirs')
     def test_generate_audio_narration_uses_configured_voice(
-        self, mock_makedirs, mock_get_client
+        self, mock_makedirs, mock_get_client, mock_file
     ):
         """Test that configured TTS voice is used."""
-        from src.summarizer import generate_audio_narration, OPENAI_TTS_VOICE
-
-        mock_client = MagicMock()
-        mock_get_client.return_value = mock_client
-        mock_response = MagicMock()
-        mock_client.audio.speech.create.return_value = mock_response
+        mock_client, _ = _mock_tts_client(mock_get_client)
 
         generate_audio_narration("Test", "vid789")
 
-        call_args = mock_client.audio.speech.create.call_args
+        call_args = mock_client.audio.speech.with_streaming_response.create.call_args
         assert call_args.kwargs['voice'] == OPENAI_TTS_VOICE
         assert call_args.kwargs['model'] == "tts-1"
 
@@ -200,16 +316,59 @@ class TestGenerateAudioNarration:
     @patch('src.summarizer.os.makedirs')
     def test_generate_audio_narration_api_error(self, mock_makedirs, mock_get_client):
         """Test error handling when TTS API call fails."""
-        from src.summarizer import generate_audio_narration
-
-        mock_client = MagicMock()
-        mock_get_client.return_value = mock_client
-        mock_client.audio.speech.create.side_effect = Exception("TTS Error")
+        mock_client, _ = _mock_tts_client(mock_get_client)
+        mock_client.audio.speech.with_streaming_response.create.side_effect = (
+            Exception("TTS Error")
+        )
 
         with pytest.raises(Exception, match="TTS Error"):
             generate_audio_narration("Test summary", "vid123")
 
 
+class TestGenerateAudioNarrations:
+    """Tests for generate_audio_narrations function."""
+
+    @patch('src.summarizer.generate_audio_narration')
+    def test_narrations_keep_input_order(self, mock_narrate):
+        """Test that each pair is narrated into output_dir and paths keep item order."""
+        mock_narrate.side_effect = (
+            lambda summary_text, video_id, output_dir: f"{output_dir}/{video_id}.mp3"
+        )
+
+        result = generate_audio_narrations(
+            [("One.", "vid1"), ("Two.", "vid2"), ("Three.", "vid3")], "/tmp/audio"
+        )
+
+        assert result == [
+            "/tmp/audio/vid1.mp3", "/tmp/audio/vid2.mp3", "/tmp/audio/vid3.mp3"
+        ]
+        assert sorted(c.args for c in mock_narrate.call_args_list) == [
+            ("One.", "vid1", "/tmp/audio"),
+            ("Three.", "vid3", "/tmp/audio"),
+            ("Two.", "vid2", "/tmp/audio"),
+        ]
+
+    @patch('src.summarizer.generate_audio_narration')
+    def test_narration_failure_raised_after_others_finish(self, mock_narrate):
+        """Test that a failed narration raises once the rest have run."""
+        def fake_narrate(summary_text, video_id, output_dir):
+            if video_id == "vid1":
+                raise Exception("TTS Error")
+            return f"{output_dir}/{video_id}.mp3"
+
+        mock_narrate.side_effect = fake_narrate
+
+        with pytest.raises(Exception, match="TTS Error"):
+            generate_audio_narrations([("One.", "vid1"), ("Two.", "vid2")])
+        assert mock_narrate.call_count == 2
+
+    @patch('src.summarizer.generate_audio_narration')
+    def test_narrations_empty(self, mock_narrate):
+        """Test that no items means no TTS calls."""
+        assert generate_audio_narrations([]) == []
+        mock_narrate.assert_not_called()
+
+
 class TestCreateSummaryWithAudio:
     """Tests for create_summary_with_audio function."""
 
@@ -219,8 +378,6 @@ class TestCreateSummaryWithAudio:
         self, mock_summarize, mock_audio
     ):
         """Test combined summary and audio generation."""
-        from src.summarizer import create_summary_with_audio
-
         mock_summarize.return_value = "This is the summary."
         mock_audio.return_value = "/path/to/audio.mp3"
 
@@ -250,8 +407,6 @@ class TestCreateSummaryWithAudio:
         self, mock_summarize, mock_audio
     ):
         """Test combined function with custom output directory."""
-        from src.summarizer import create_summary_with_audio
-
         mock_summarize.return_value = "Summary"
         mock_audio.return_value = "/custom/path/audio.mp3"
 
@@ -270,8 +425,6 @@ class TestChunkTranscript:
 
     def test_chunk_transcript_short_text(self):
         """Test that short transcripts are not chunked."""
-        from src.summarizer import chunk_transcript
-
         short_text = "This is a short transcript."
         chunks = chunk_transcript(short_text)
 
@@ -280,8 +433,6 @@ class TestChunkTranscript:
 
     def test_chunk_transcript_splits_long_text(self):
         """Test that long transcripts are split into chunks."""
-        from src.summarizer import chunk_transcript
-
         # Create a long transcript (use small max_tokens for testing)
         long_text = ". ".join([f"This is sentence number {i}" for i in range(100)])
         chunks = chunk_transcript(long_text, max_tokens=50)  # ~200 chars max
@@ -292,18 +443,41 @@ class TestChunkTranscript:
 
     def test_chunk_transcript_preserves_sentence_endings(self):
         """Test that chunks end with periods."""
-        from src.summarizer import chunk_transcript
-
         text = "First sentence. Second sentence. Third sentence. Fourth sentence."
         chunks = chunk_transcript(text, max_tokens=10)  # Force chunking
 
         for chunk in chunks:
             assert chunk.endswith('.')
 
+    def test_chunk_transcript_uses_tokenizer_counts(self, monkeypatch):
+        """Test that chunk budgets use the tokenizer's counts when available."""
+        # One token per word (and per '.' separator); the 4-chars-per-token
+        # estimate would instead count ~12 tokens per sentence
+        fake_encoding = MagicMock()
+        fake_encoding.encode.side_effect = lambda text, **kwargs: text.split()
+        monkeypatch.setattr(summarizer, "_encoding", fake_encoding)
+
+        text = ". ".join(["one two three four five six seven eight nine ten"] * 4)
+        chunks = summarizer.chunk_transcript(text, max_tokens=21)
+
+        assert len(chunks) == 2
+        assert all(len(chunk.split()) == 20 for chunk in chunks)
+
+    def test_count_tokens_uses_encoding(self, monkeypatch):
+        """Test that tokens are counted with the loaded encoding."""
+        fake_encoding = MagicMock()
+        fake_encoding.encode.return_value = [1, 2, 3]
+        monkeypatch.setattr(summarizer, "_encoding", fake_encoding)
+
+        assert summarizer._count_tokens("any text") == 3
+        fake_encoding.encode.assert_called_once_with("any text", disallowed_special=())
+
+    def test_count_tokens_estimates_without_encoding(self):
+        """Test the 4-characters-per-token estimate when tiktoken is unavailable."""
+        assert summarizer._count_tokens("x" * 40) == 10
+
     def test_chunk_transcript_empty_text(self):
         """Test handling of empty transcript."""
-        from src.summarizer import chunk_transcript
-
         chunks = chunk_transcript("")
 
         assert len(chunks) == 1
@@ -319,8 +493,6 @@ class TestSummarizeLongTranscript:
         self, mock_chunk, mock_summarize
     ):
         """Test that single-chunk transcripts are summarized directly."""
-        from src.summarizer import summarize_long_transcript
-
         mock_chunk.return_value = ["Short transcript"]
         mock_summarize.return_value = "This is the summary."
 
@@ -343,15 +515,15 @@ class TestSummarizeLongTranscript:
         self, mock_chunk, mock_summarize
     ):
         """Test multi-chunk summarization."""
-        from src.summarizer import summarize_long_transcript
-
         mock_chunk.return_value = ["Chunk 1", "Chunk 2", "Chunk 3"]
-        mock_summarize.side_effect = [
-            "Summary of chunk 1.",
-            "Summary of chunk 2.",
-            "Summary of chunk 3.",
-            "Final combined summary."
-        ]
+
+        # Chunks are summarized concurrently, so answer by input, not call order
+        def fake_summarize(text, title, url=None):
+            if text.startswith("Chunk"):
+                return f"Summary of {text.lower()}."
+            return "Final combined summary."
+
+        mock_summarize.side_effect = fake_summarize
 
         result = summarize_long_transcript(
             "Long transcript...",
@@ -361,52 +533,134 @@ class TestSummarizeLongTranscript:
         assert result == "Final combined summary."
         assert mock_summarize.call_count == 4
 
-        # Verify chunk summaries were called with part numbers
-        calls = mock_summarize.call_args_list
-        assert "Part 1" in calls[0][0][1]
-        assert "Part 2" in calls[1][0][1]
-        assert "Part 3" in calls[2][0][1]
+        # Verify each chunk was summarized with its part number
+        chunk_calls = {call[0][0]: call[0][1] for call in mock_summarize.call_args_list[:3]}
+        assert chunk_calls == {
+            "Chunk 1": "Video Title (Part 1)",
+            "Chunk 2": "Video Title (Part 2)",
+            "Chunk 3": "Video Title (Part 3)",
+        }
+
+        # The final call combines chunk summaries in original order
+        final_call = mock_summarize.call_args_list[3]
+        assert final_call[0][0] == (
+            "Summary of chunk 1.\n\nSummary of chunk 2.\n\nSummary of chunk 3."
+        )
+
+
+@pytest.fixture
+def summary_cache(tmp_path, monkeypatch):
+    """Enable the summarizer's API cache in a throwaway SQLite file."""
+    cache_path = tmp_path / "cache" / "summaries.db"
+    monkeypatch.setattr('src.summarizer.SUMMARY_CACHE_PATH', str(cache_path))
+    return cache_path
+
+
+@pytest.mark.usefixtures("summary_cache")
+class TestApiCache:
+    """Tests for the on-disk cache of summarization and TTS results."""
+
+    @staticmethod
+    def _mock_chat_client(mock_get_client, content="Cached summary."):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.chat.completions.create.return_value = _chat_response(content)
+        return mock_client
+
+    @patch('src.summarizer.get_openai_client')
+    def test_repeat_summary_served_from_cache(self, mock_get_client):
+        """Test that an identical second call does not hit the API."""
+        mock_client = self._mock_chat_client(mock_get_client)
+
+        first = summarize_transcript("Transcript", "Title", "https://youtu.be/x")
+        second = summarize_transcript("Transcript", "Title", "https://youtu.be/x")
+
+        assert first == second == "Cached summary."
+        mock_client.chat.completions.create.assert_called_once()
+
+    @patch('src.summarizer.get_openai_client')
+    def test_different_transcript_misses_cache(self, mock_get_client):
+        """Test that changed inputs produce a fresh API call."""
+        mock_client = self._mock_chat_client(mock_get_client)
+
+        summarize_transcript("Transcript one", "Title")
+        summarize_transcript("Transcript two", "Title")
+
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @patch('src.summarizer.get_openai_client')
+    def test_repeat_narration_reuses_audio_file(self, mock_get_client, tmp_path):
+        """Test that narrating the same text again reuses the existing file."""
+        mock_client, _ = _mock_tts_client(mock_get_client)
+        output_dir = str(tmp_path / "audio")
+
+        first = generate_audio_narration("Summary text", "vid1", output_dir)
+        second = generate_audio_narration("Summary text", "vid1", output_dir)
+
+        assert first == second
+        mock_client.audio.speech.with_streaming_response.create.assert_called_once()
+
+    @patch('src.summarizer.get_openai_client')
+    def test_narration_overwritten_by_other_text_is_redone(
+        self, mock_get_client, tmp_path
+    ):
+        """Test that text A is narrated again after text B overwrote its file."""
+        mock_client, mock_response = _mock_tts_client(mock_get_client)
+        mock_response.iter_bytes.side_effect = [
+            iter([b"audio A"]), iter([b"audio B"]), iter([b"audio A"])
+        ]
+        output_dir = str(tmp_path / "audio")
+
+        generate_audio_narration("Summary A", "vid1", output_dir)
+        generate_audio_narration("Summary B", "vid1", output_dir)
+        path = generate_audio_narration("Summary A", "vid1", output_dir)
+
+        assert mock_client.audio.speech.with_streaming_response.create.call_count == 3
+        with open(path, 'rb') as f:
+            assert f.read() == b"audio A"
 
 
 class TestCostTracking:
     """Tests for cost tracking and logging."""
 
+    @patch('src.summarizer.SUMMARY_MODEL', 'gpt-4o-mini')
     @patch('src.summarizer.logger')
     @patch('src.summarizer.get_openai_client')
     def test_summarize_logs_cost(self, mock_get_client, mock_logger):
         """Test that summarization logs cost estimate."""
-        from src.summarizer import summarize_transcript
-
         mock_client = MagicMock()
         mock_get_client.return_value = mock_client
-
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Summary"
-        mock_response.usage.total_tokens = 1000
-        mock_response.usage.prompt_tokens = 900
-        mock_response.usage.completion_tokens = 100
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = _chat_response(
+            "Summary", 1000, 900, 100
+        )
 
         summarize_transcript("Test", "Title")
 
-        # Verify logger.info was called with cost information
+        # Verify logger.info was called with cost information:
+        # 900 * $0.00015/1K + 100 * $0.0006/1K = $0.000195
         assert mock_logger.info.called
         log_call = mock_logger.info.call_args[0][0]
         assert "1000 tokens" in log_call
-        assert "$" in log_call
-
+        assert "~$0.000195" in log_call
+
+    @pytest.mark.parametrize("model, expected", [
+        ("gpt-4o-mini", 0.000195),
+        ("gpt-4-turbo", 0.012),
+        ("unknown-model", 0.012),
+    ])
+    def test_estimate_cost(self, model, expected):
+        """Test cost estimates against per-model rates for 900 in / 100 out tokens."""
+        assert summarizer._estimate_cost(model, 900, 100) == pytest.approx(expected)
+
+    @patch('src.summarizer.open', new_callable=mock_open, create=True)
     @patch('src.summarizer.logger')
     @patch('src.summarizer.os.makedirs')
     @patch('src.summarizer.get_openai_client')
-    def test_audio_logs_cost(self, mock_get_client, mock_makedirs, mock_logger):
+    def test_audio_logs_cost(
+        self, mock_get_client, mock_makedirs, mock_logger, mock_file
+    ):
         """Test that audio generation logs cost estimate."""
-        from src.summarizer import generate_audio_narration
-
-        mock_client = MagicMock()
-        mock_get_client.return_value = mock_client
-        mock_response = MagicMock()
-        mock_client.audio.speech.create.return_value = mock_response
+        _mock_tts_client(mock_get_client)
 
         generate_audio_narration("This is a test summary with some text.", "vid123")
 
@@ -4,6 +4,7 @@ These tests use mocks to avoid making real API calls during testing.
 """
 
 import pytest
+import threading
 from unittest.mock import MagicMock, patch
 
 from youtube_transcript_api._errors import (
@@ -64,6 +65,33 @@ class TestCleanTranscriptText:
         cleaned = clean_transcript_text(raw)
         assert cleaned == ""
 
+    def test_fast_path_clean_string(self):
+        """Test that already-clean text is returned without rebuilding it."""
+        from src.transcript import clean_transcript_text
+
+        raw = "Already clean text with single spaces."
+        assert clean_transcript_text(raw) is raw
+
+    @pytest.mark.parametrize("raw, expected", [
+        ("Hello\nworld", "Hello world"),
+        ("Hello\tworld", "Hello world"),
+        ("Hello\u00a0world", "Hello world"),
+        (" Hello", "Hello"),
+        ("Hello ", "Hello"),
+    ])
+    def test_fast_path_skips_unclean_whitespace(self, raw, expected):
+        """Test that whitespace other than single spaces still gets cleaned."""
+        from src.transcript import clean_transcript_text
+
+        assert clean_transcript_text(raw) == expected
+
+    def test_unclosed_brackets_kept(self):
+        """Test that unclosed '[' is kept and the next annotation still removed."""
+        from src.transcript import clean_transcript_text
+
+        assert clean_transcript_text("a [b [Music] c") == "a [b c"
+        assert clean_transcript_text("[" * 50_000 + "x") == "[" * 50_000 + "x"
+
     def test_combined_cleaning(self):
         """Test combined cleaning of annotations and whitespace."""
         from src.transcript import clean_transcript_text
@@ -234,6 +262,66 @@ class TestGetTranscript:
         assert mock_transcript_list.find_transcript.call_count == 2
 
 
+class TestGetTranscriptApi:
+    """Tests for get_transcript_api function."""
+
+    @patch('src.transcript.YouTubeTranscriptApi')
+    def test_get_transcript_api_reused(self, mock_api):
+        """Test that lookups share one API instance and its HTTP session."""
+        from src.transcript import get_transcript_api
+
+        assert get_transcript_api() is get_transcript_api()
+        mock_api.assert_called_once_with()
+
+    @patch('src.transcript.YouTubeTranscriptApi')
+    def test_get_transcript_api_per_thread(self, mock_api):
+        """Test that each thread gets its own API instance and session."""
+        from src.transcript import get_transcript_api
+
+        mock_api.side_effect = lambda: MagicMock()
+        instances = []
+        worker = threading.Thread(target=lambda: instances.append(get_transcript_api()))
+        worker.start()
+        worker.join()
+
+        assert get_transcript_api() is not instances[0]
+        assert mock_api.call_count == 2
+
+
+class TestGetTranscripts:
+    """Tests for get_transcripts function."""
+
+    @patch('src.transcript.get_transcript')
+    def test_get_transcripts_maps_ids_in_order(self, mock_get_transcript):
+        """Test that each video ID maps to its own transcript or None."""
+        from src.transcript import get_transcripts
+
+        # Fetches run concurrently, so answer by video ID, not call order
+        def fake_get_transcript(video_id, languages):
+            return None if video_id == 'vid2' else f"Text of {video_id}"
+
+        mock_get_transcript.side_effect = fake_get_transcript
+
+        result = get_transcripts(['vid1', 'vid2', 'vid3'], languages=['es'])
+
+        assert list(result.items()) == [
+            ('vid1', 'Text of vid1'),
+            ('vid2', None),
+            ('vid3', 'Text of vid3'),
+        ]
+        assert all(
+            call.args[1] == ['es'] for call in mock_get_transcript.call_args_list
+        )
+
+    @patch('src.transcript.get_transcript')
+    def test_get_transcripts_empty(self, mock_get_transcript):
+        """Test that no videos means no fetches."""
+        from src.transcript import get_transcripts
+
+        assert get_transcripts([]) == {}
+        mock_get_transcript.assert_not_called()
+
+
 class TestGetAvailableLanguages:
     """Tests for get_available_languages function."""
 
@@ -3,20 +3,37 @@
 These tests use mocks to avoid consuming API quota during testing.
 """
 
+import httplib2
 import pytest
+import threading
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 from googleapiclient.errors import HttpError
 
+from src.youtube_client import (
+    CHANNELS_FIELDS,
+    PLAYLIST_ITEMS_FIELDS,
+    QuotaTracker,
+    YouTubeClient,
+    _OrjsonModel,
+    get_youtube_client,
+)
+
+
+@pytest.fixture
+def mock_youtube(monkeypatch):
+    """Patch build() so every client gets the same mock service."""
+    service = MagicMock()
+    monkeypatch.setattr('src.youtube_client.build', MagicMock(return_value=service))
+    return service
+
 
 class TestQuotaTracker:
     """Tests for QuotaTracker class."""
     
     def test_log_usage_tracks_units(self):
         """Test that log_usage correctly tracks quota units."""
-        from src.youtube_client import QuotaTracker
-        
         tracker = QuotaTracker()
         tracker.log_usage('test_operation', 10)
         
@@ -26,8 +43,6 @@ class TestQuotaTracker:
     
     def test_log_usage_accumulates(self):
         """Test that multiple operations accumulate correctly."""
-        from src.youtube_client import QuotaTracker
-        
         tracker = QuotaTracker()
         tracker.log_usage('op1', 5)
         tracker.log_usage('op2', 10)
@@ -38,8 +53,6 @@ class TestQuotaTracker:
     
     def test_reset(self):
         """Test that reset clears all tracking data."""
-        from src.youtube_client import QuotaTracker
-        
         tracker = QuotaTracker()
         tracker.log_usage('op1', 10)
         tracker.reset()
@@ -53,15 +66,11 @@ class TestYouTubeClient:
     
     def test_init_with_api_key(self):
         """Test client initialization with explicit API key."""
-        from src.youtube_client import YouTubeClient
-        
         client = YouTubeClient(api_key='test_api_key')
         assert client._api_key == 'test_api_key'
     
     def test_init_without_api_key_raises_error(self):
         """Test that initialization without API key raises ValueError."""
-        from src.youtube_client import YouTubeClient
-        
         with patch('src.youtube_client.YOUTUBE_API_KEY', None):
             with pytest.raises(ValueError, match="YouTube API key is required"):
                 YouTubeClient(api_key=None)
@@ -69,8 +78,6 @@ class TestYouTubeClient:
     @patch('src.youtube_client.build')
     def test_youtube_property_lazy_init(self, mock_build):
         """Test that YouTube service is lazily initialized."""
-        from src.youtube_client import YouTubeClient
-        
         mock_service = MagicMock()
         mock_build.return_value = mock_service
         
@@ -82,18 +89,51 @@ class TestYouTubeClient:
         # Access the property
         service = client.youtube
         
-        # Now it should be built
-        mock_build.assert_called_once_with('youtube', 'v3', developerKey='test_key')
+        # Now it should be built, from the bundled discovery document
+        mock_build.assert_called_once()
+        assert mock_build.call_args.args == ('youtube', 'v3')
+        assert mock_build.call_args.kwargs['developerKey'] == 'test_key'
+        assert mock_build.call_args.kwargs['static_discovery'] is True
         assert service == mock_service
-    
+
+    @patch('src.youtube_client.build')
+    def test_youtube_service_shared_across_clients(self, mock_build):
+        """Test that clients with the same key reuse one built service."""
+        mock_build.side_effect = lambda *args, **kwargs: MagicMock()
+
+        first = YouTubeClient(api_key='test_key')
+        second = YouTubeClient(api_key='test_key')
+        other = YouTubeClient(api_key='other_key')
+
+        assert first.youtube is second.youtube
+        assert other.youtube is not first.youtube
+        assert mock_build.call_count == 2
+
+    def test_orjson_model_deserializes_response(self):
+        """Test that the orjson response model decodes bodies like JsonModel."""
+        pytest.importorskip('orjson')
+        body = _OrjsonModel().deserialize(b'{"items": [{"id": "UC123"}]}')
+
+        assert body == {'items': [{'id': 'UC123'}]}
+
+    def test_orjson_model_returns_non_json_body_as_text(self):
+        """Test that a non-JSON body falls back to its text like JsonModel."""
+        pytest.importorskip('orjson')
+        body = _OrjsonModel().deserialize(b'<html>Bad gateway</html>')
+
+        assert body == '<html>Bad gateway</html>'
+
     @patch('src.youtube_client.build')
-    def test_get_subscriptions_single_page(self, mock_build):
+    def test_service_built_with_orjson_model(self, mock_build):
+        """Test that build() gets the orjson response model when orjson is installed."""
+        pytest.importorskip('orjson')
+
+        YouTubeClient(api_key='test_key').youtube
+
+        assert isinstance(mock_build.call_args.kwargs['model'], _OrjsonModel)
+    
+    def test_get_subscriptions_single_page(self, mock_youtube):
         """Test fetching subscriptions with single page of results."""
-        from src.youtube_client import YouTubeClient
-        
-        mock_youtube = MagicMock()
-        mock_build.return_value = mock_youtube
-        
         mock_youtube.subscriptions().list().execute.return_value = {
             'items': [
                 {
@@ -111,6 +151,8 @@ class TestYouTubeClient:
             ]
         }
         
+        mock_youtube.subscriptions().list_next.return_value = None
+        
         client = YouTubeClient(api_key='test_key')
         subscriptions = client.get_subscriptions()
         
@@ -118,14 +160,8 @@ class TestYouTubeClient:
         assert subscriptions[0] == {'channel_id': 'UC123', 'channel_name': 'Test Channel 1'}
         assert subscriptions[1] == {'channel_id': 'UC456', 'channel_name': 'Test Channel 2'}
     
-    @patch('src.youtube_client.build')
-    def test_get_subscriptions_with_pagination(self, mock_build):
+    def test_get_subscriptions_with_pagination(self, mock_youtube):
         """Test fetching subscriptions with multiple pages."""
-        from src.youtube_client import YouTubeClient
-        
-        mock_youtube = MagicMock()
-        mock_build.return_value = mock_youtube
-        
         # First page
         first_response = {
             'items': [
@@ -151,23 +187,45 @@ class TestYouTubeClient:
             ]
         }
         
-        mock_youtube.subscriptions().list().execute.side_effect = [
-            first_response, second_response
-        ]
+        first_request = mock_youtube.subscriptions().list()
+        first_request.execute.return_value = first_response
+        second_request = MagicMock()
+        second_request.execute.return_value = second_response
+        # list_next() builds the request for page 2, then None after it
+        mock_youtube.subscriptions().list_next.side_effect = [second_request, None]
         
         client = YouTubeClient(api_key='test_key')
         subscriptions = client.get_subscriptions()
         
         assert len(subscriptions) == 2
+        mock_youtube.subscriptions().list_next.assert_any_call(
+            first_request, first_response
+        )
     
-    @patch('src.youtube_client.build')
-    def test_get_channel_uploads_playlist_id(self, mock_build):
+    def test_iter_subscriptions_streams_lazily(self, mock_youtube):
+        """Test that the next page is only fetched once the first is consumed."""
+        def page(channel_id):
+            return {'items': [{'snippet': {
+                'resourceId': {'channelId': channel_id}, 'title': channel_id
+            }}]}
+
+        first_request = mock_youtube.subscriptions().list()
+        first_request.execute.return_value = page('UC123')
+        second_request = MagicMock()
+        second_request.execute.return_value = page('UC456')
+        mock_youtube.subscriptions().list_next.side_effect = [second_request, None]
+
+        client = YouTubeClient(api_key='test_key')
+        subscriptions = client.iter_subscriptions()
+
+        assert next(subscriptions)['channel_id'] == 'UC123'
+        second_request.execute.assert_not_called()
+        assert next(subscriptions)['channel_id'] == 'UC456'
+        assert list(subscriptions) == []
+        assert client.quota_tracker.get_total_usage() == 2
+    
+    def test_get_channel_uploads_playlist_id(self, mock_youtube):
         """Test fetching uploads playlist ID for a channel."""
-        from src.youtube_client import YouTubeClient
-        
-        mock_youtube = MagicMock()
-        mock_build.return_value = mock_youtube
-        
         mock_youtube.channels().list().execute.return_value = {
             'items': [
                 {
@@ -185,14 +243,8 @@ class TestYouTubeClient:
         
         assert playlist_id == 'UU123'
     
-    @patch('src.youtube_client.build')
-    def test_get_channel_uploads_playlist_id_not_found(self, mock_build):
+    def test_get_channel_uploads_playlist_id_not_found(self, mock_youtube):
         """Test handling when channel is not found."""
-        from src.youtube_client import YouTubeClient
-        
-        mock_youtube = MagicMock()
-        mock_build.return_value = mock_youtube
-        
         mock_youtube.channels().list().execute.return_value = {'items': []}
         
         client = YouTubeClient(api_key='test_key')
@@ -200,14 +252,32 @@ class TestYouTubeClient:
         
         assert playlist_id is None
     
-    @patch('src.youtube_client.build')
-    def test_get_recent_videos(self, mock_build):
+    def test_get_channel_uploads_playlist_ids_batches(self, mock_youtube, monkeypatch):
+        """Test that channels are resolved in one channels.list call per batch."""
+        monkeypatch.setattr('src.youtube_client.CHANNELS_BATCH_SIZE', 2)
+
+        def channel(channel_id):
+            return {
+                'id': channel_id,
+                'contentDetails': {'relatedPlaylists': {'uploads': 'UU' + channel_id[2:]}}
+            }
+
+        # UC3 is not returned, as for a deleted channel
+        channels_list = mock_youtube.channels().list
+        channels_list.return_value.execute.side_effect = [
+            {'items': [channel('UC1'), channel('UC2')]},
+            {'items': []},
+        ]
+
+        client = YouTubeClient(api_key='test_key')
+        playlist_ids = client.get_channel_uploads_playlist_ids(['UC1', 'UC2', 'UC3'])
+
+        assert playlist_ids == {'UC1': 'UU1', 'UC2': 'UU2'}
+        assert [c.kwargs['id'] for c in channels_list.call_args_list] == ['UC1,UC2', 'UC3']
+        assert client.quota_tracker.get_total_usage() == 2
+
+    def test_get_recent_videos(self, mock_youtube):
         """Test fetching recent videos from a channel."""
-        from src.youtube_client import YouTubeClient
-        
-        mock_youtube = MagicMock()
-        mock_build.return_value = mock_youtube
-        
         # Mock channel response
         mock_youtube.channels().list().execute.return_value = {
             'items': [
@@ -266,15 +336,60 @@ class TestYouTubeClient:
         assert len(videos) == 1
         assert videos[0]['video_id'] == 'vid123'
         assert videos[0]['title'] == 'Recent Video'
+
+    def test_get_recent_videos_stops_paginating_on_old_item(self, mock_youtube):
+        """Test that an item older than the window ends pagination."""
+        mock_youtube.channels().list().execute.return_value = {
+            'items': [{'contentDetails': {'relatedPlaylists': {'uploads': 'UU123'}}}]
+        }
+
+        def item(video_id, hours_ago):
+            published = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+            return {
+                'snippet': {'publishedAt': published.isoformat(), 'title': video_id},
+                'contentDetails': {'videoId': video_id}
+            }
+
+        # Page 1 ends with an old video; page 2 must never be requested
+        mock_youtube.playlistItems().list().execute.side_effect = [
+            {'items': [item('new', 1), item('old', 48)], 'nextPageToken': 'page2'},
+            {'items': [item('older', 72)]},
+        ]
+
+        client = YouTubeClient(api_key='test_key')
+        videos = client.get_recent_videos('UC123', hours=24)
+
+        assert [v['video_id'] for v in videos] == ['new']
+        assert mock_youtube.playlistItems().list().execute.call_count == 1
+
+    def test_requests_use_fields_filter(self, mock_youtube):
+        """Test that list calls ask only for the fields the client reads."""
+        mock_youtube.channels().list().execute.return_value = {
+            'items': [{'contentDetails': {'relatedPlaylists': {'uploads': 'UU123'}}}]
+        }
+        mock_youtube.playlistItems().list().execute.return_value = {'items': []}
+
+        client = YouTubeClient(api_key='test_key')
+        client.get_recent_videos('UC123', hours=24)
+
+        channels_kwargs = mock_youtube.channels().list.call_args.kwargs
+        playlist_kwargs = mock_youtube.playlistItems().list.call_args.kwargs
+        assert channels_kwargs['fields'] == CHANNELS_FIELDS
+        assert playlist_kwargs['fields'] == PLAYLIST_ITEMS_FIELDS
+
+    def test_get_recent_videos_uses_max_results_50(self, mock_youtube):
+        """Test that uploads are read in pages of 50, the API maximum."""
+        mock_youtube.playlistItems().list().execute.return_value = {'items': []}
+
+        client = YouTubeClient(api_key='test_key')
+        client.get_recent_videos('UC123', hours=24, uploads_playlist_id='UU123')
+
+        playlist_kwargs = mock_youtube.playlistItems().list.call_args.kwargs
+        assert playlist_kwargs['maxResults'] == 50
+        assert playlist_kwargs['playlistId'] == 'UU123'
     
-    @patch('src.youtube_client.build')
-    def test_get_recent_videos_channel_not_found(self, mock_build):
+    def test_get_recent_videos_channel_not_found(self, mock_youtube):
         """Test handling when channel is not found."""
-        from src.youtube_client import YouTubeClient
-        
-        mock_youtube = MagicMock()
-        mock_build.return_value = mock_youtube
-        
         mock_youtube.channels().list().execute.return_value = {'items': []}
         
         client = YouTubeClient(api_key='test_key')
@@ -282,15 +397,9 @@ class TestYouTubeClient:
         
         assert videos == []
     
-    @patch('src.youtube_client.build')
     @patch('time.sleep')
-    def test_api_call_with_retry_on_rate_limit(self, mock_sleep, mock_build):
+    def test_api_call_with_retry_on_rate_limit(self, mock_sleep, mock_youtube):
         """Test retry logic on rate limit errors."""
-        from src.youtube_client import YouTubeClient
-        
-        mock_youtube = MagicMock()
-        mock_build.return_value = mock_youtube
-        
         # Create a mock HTTP error response
         mock_resp = MagicMock()
         mock_resp.status = 429
@@ -315,35 +424,72 @@ class TestYouTubeClient:
         
         assert playlist_id == 'UU123'
         assert mock_sleep.call_count == 2
+        first_delay, second_delay = (c.args[0] for c in mock_sleep.call_args_list)
+        assert first_delay < second_delay
+
+    @patch('time.sleep')
+    def test_api_call_gives_up_without_final_sleep(self, mock_sleep, mock_youtube):
+        """Test that exhausted retries raise without sleeping after the last try."""
+        mock_resp = MagicMock()
+        mock_resp.status = 429
+        mock_youtube.channels().list().execute.side_effect = HttpError(
+            mock_resp, b'Rate limit exceeded'
+        )
+
+        client = YouTubeClient(api_key='test_key')
+
+        with pytest.raises(Exception, match="Max retries"):
+            client.get_channel_uploads_playlist_id('UC123')
+        assert mock_youtube.channels().list().execute.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch('time.sleep')
+    def test_api_call_retries_on_503(self, mock_sleep, mock_youtube):
+        """Test that a transient server error is retried."""
+        mock_resp = MagicMock()
+        mock_resp.status = 503
+        mock_youtube.channels().list().execute.side_effect = [
+            HttpError(mock_resp, b'Service unavailable'),
+            {'items': [{'contentDetails': {'relatedPlaylists': {'uploads': 'UU123'}}}]}
+        ]
+
+        client = YouTubeClient(api_key='test_key')
+
+        assert client.get_channel_uploads_playlist_id('UC123') == 'UU123'
+        assert mock_sleep.call_count == 1
+
+    @patch('time.sleep')
+    def test_api_call_honors_retry_after(self, mock_sleep, mock_youtube):
+        """Test that a Retry-After header overrides the backoff delay."""
+        mock_resp = httplib2.Response({'status': 429, 'retry-after': '7'})
+        mock_youtube.channels().list().execute.side_effect = [
+            HttpError(mock_resp, b'Rate limit exceeded'),
+            {'items': [{'contentDetails': {'relatedPlaylists': {'uploads': 'UU123'}}}]}
+        ]
+
+        client = YouTubeClient(api_key='test_key')
+
+        assert client.get_channel_uploads_playlist_id('UC123') == 'UU123'
+        mock_sleep.assert_called_once_with(7.0)
     
-    @patch('src.youtube_client.build')
-    def test_api_call_non_retryable_error(self, mock_build):
+    @pytest.mark.parametrize('status', [400, 401, 404])
+    def test_api_call_non_retryable_error(self, mock_youtube, status):
         """Test that non-retryable errors are raised immediately."""
-        from src.youtube_client import YouTubeClient
-        
-        mock_youtube = MagicMock()
-        mock_build.return_value = mock_youtube
-        
         mock_resp = MagicMock()
-        mock_resp.status = 404  # Not found - non-retryable
+        mock_resp.status = status
         
         mock_youtube.channels().list().execute.side_effect = HttpError(
-            mock_resp, b'Not found'
+            mock_resp, b'Client error'
         )
         
         client = YouTubeClient(api_key='test_key')
         
         with pytest.raises(HttpError):
             client.get_channel_uploads_playlist_id('UC_NONEXISTENT')
+        assert mock_youtube.channels().list().execute.call_count == 1
     
-    @patch('src.youtube_client.build')
-    def test_quota_tracking(self, mock_build):
+    def test_quota_tracking(self, mock_youtube):
         """Test that quota usage is tracked correctly."""
-        from src.youtube_client import YouTubeClient
-        
-        mock_youtube = MagicMock()
-        mock_build.return_value = mock_youtube
-        
         mock_youtube.channels().list().execute.return_value = {
             'items': [
                 {
@@ -377,14 +523,142 @@ class TestYouTubeClient:
         assert client.quota_tracker.get_total_usage() == 2
         assert len(client.quota_tracker.operations) == 2
 
+    @patch('src.youtube_client.build')
+    def test_youtube_property_per_thread(self, mock_build):
+        """Test that each thread gets its own service object."""
+        mock_build.side_effect = lambda *args, **kwargs: MagicMock()
+        client = YouTubeClient(api_key='test_key')
+
+        services = []
+        worker = threading.Thread(target=lambda: services.append(client.youtube))
+        worker.start()
+        worker.join()
+
+        assert client.youtube is client.youtube
+        assert client.youtube is not services[0]
+        assert mock_build.call_count == 2
+
+    def test_get_recent_videos_from_subscriptions_merges_newest_first(self):
+        """Test that limited subscriptions are scanned in bulk and merged by date."""
+        client = YouTubeClient(api_key='test_key')
+        client.get_subscriptions = MagicMock(return_value=[
+            {'channel_id': 'UC1', 'channel_name': 'Channel 1'},
+            {'channel_id': 'UC2', 'channel_name': 'Channel 2'},
+            {'channel_id': 'UC3', 'channel_name': 'Channel 3'},
+        ])
+        client.get_recent_videos_bulk = MagicMock(return_value={
+            'UC1': [
+                {'video_id': 'a', 'published_at': '2024-01-01T00:00:00Z'},
+                {'video_id': 'c', 'published_at': '2024-01-03T00:00:00Z'},
+            ],
+            'UC2': [{'video_id': 'b', 'published_at': '2024-01-02T00:00:00Z'}],
+        })
+
+        videos = client.get_recent_videos_from_subscriptions(hours=12, max_channels=2)
+
+        assert [v['video_id'] for v in videos] == ['c', 'b', 'a']
+        client.get_recent_videos_bulk.assert_called_once_with(['UC1', 'UC2'], 12, 10)
+
+    def test_get_recent_videos_bulk(self):
+        """Test that bulk scans return every channel in input order."""
+        client = YouTubeClient(api_key='test_key')
+        # UC_MISSING has no uploads playlist, UC_ERR fails mid-scan
+        client.get_channel_uploads_playlist_ids = MagicMock(
+            return_value={'UC1': 'UU1', 'UC_ERR': 'UU_ERR'}
+        )
+        mock_resp = MagicMock()
+        mock_resp.status = 500
+
+        def fake_get_recent_videos(channel_id, hours, uploads_playlist_id):
+            if channel_id == 'UC_ERR':
+                raise HttpError(mock_resp, b'Backend error')
+            return [{'video_id': 'vid1'}]
+
+        client.get_recent_videos = MagicMock(side_effect=fake_get_recent_videos)
+
+        results = client.get_recent_videos_bulk(['UC_ERR', 'UC1', 'UC_MISSING'])
+
+        assert list(results) == ['UC_ERR', 'UC1', 'UC_MISSING']
+        assert results == {'UC_ERR': [], 'UC1': [{'video_id': 'vid1'}], 'UC_MISSING': []}
+        assert client.get_recent_videos.call_count == 2
+
+    @patch('time.sleep')
+    def test_get_recent_videos_bulk_survives_exhausted_retries(self, mock_sleep, mock_youtube):
+        """Test that a channel that runs out of retries doesn't drop the others."""
+        mock_resp = MagicMock()
+        mock_resp.status = 429
+        recent = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+        requests = {
+            'UU1': MagicMock(**{'execute.return_value': {'items': [{
+                'snippet': {'publishedAt': recent, 'title': 'New'},
+                'contentDetails': {'videoId': 'vid1'},
+            }]}}),
+            'UU2': MagicMock(**{
+                'execute.side_effect': HttpError(mock_resp, b'Rate limit exceeded')
+            }),
+        }
+        mock_youtube.playlistItems().list.side_effect = (
+            lambda **kwargs: requests[kwargs['playlistId']]
+        )
+
+        client = YouTubeClient(api_key='test_key')
+        client.get_channel_uploads_playlist_ids = MagicMock(
+            return_value={'UC1': 'UU1', 'UC2': 'UU2'}
+        )
+
+        results = client.get_recent_videos_bulk(['UC1', 'UC2'])
+
+        assert [v['video_id'] for v in results['UC1']] == ['vid1']
+        assert results['UC2'] == []
+        # Three attempts for UC2, with no sleep after the last
+        assert mock_sleep.call_count == 2
+
+
+@pytest.fixture
+def playlist_cache(tmp_path, monkeypatch):
+    """Enable the uploads playlist cache in a throwaway SQLite file."""
+    cache_path = tmp_path / "cache" / "youtube.db"
+    monkeypatch.setattr('src.youtube_client.PLAYLIST_CACHE_PATH', str(cache_path))
+    return cache_path
+
+
+@pytest.mark.usefixtures("playlist_cache")
+class TestPlaylistCache:
+    """Tests for the on-disk cache of channel uploads playlist IDs."""
+
+    CHANNEL_RESPONSE = {
+        'items': [{'contentDetails': {'relatedPlaylists': {'uploads': 'UU123'}}}]
+    }
+
+    def test_repeat_lookup_served_from_cache(self, mock_youtube):
+        """Test that a second client reuses the ID without calling channels.list."""
+        mock_youtube.channels().list().execute.return_value = self.CHANNEL_RESPONSE
+
+        first = YouTubeClient(api_key='test_key')
+        second = YouTubeClient(api_key='test_key')
+
+        assert first.get_channel_uploads_playlist_id('UC123') == 'UU123'
+        assert second.get_channel_uploads_playlist_id('UC123') == 'UU123'
+        assert mock_youtube.channels().list().execute.call_count == 1
+        assert second.quota_tracker.get_total_usage() == 0
+
+    def test_expired_entry_refetched(self, mock_youtube, monkeypatch):
+        """Test that entries older than the TTL trigger a fresh lookup."""
+        mock_youtube.channels().list().execute.return_value = self.CHANNEL_RESPONSE
+        client = YouTubeClient(api_key='test_key')
+
+        client.get_channel_uploads_playlist_id('UC123')
+        monkeypatch.setattr('src.youtube_client.PLAYLIST_CACHE_TTL_SECONDS', -1)
+        client.get_channel_uploads_playlist_id('UC123')
+
+        assert mock_youtube.channels().list().execute.call_count == 2
+
 
 class TestGetYouTubeClient:
     """Tests for get_youtube_client factory function."""
     
     def test_creates_client_with_api_key(self):
         """Test factory function creates client with provided API key."""
-        from src.youtube_client import get_youtube_client, YouTubeClient
-        
         client = get_youtube_client(api_key='test_key')
         
         assert isinstance(client, YouTubeClient)